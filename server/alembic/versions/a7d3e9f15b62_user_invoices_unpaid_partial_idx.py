@@ -0,0 +1,28 @@
+"""partial index on unpaid user_invoices in list order
+
+Revision ID: a7d3e9f15b62
+Revises: f2b6d0c8a417
+Create Date: 2025-10-11
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a7d3e9f15b62"
+down_revision = "f2b6d0c8a417"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_user_invoices_unpaid "
+        "ON user_invoices (client_id, due_date, created_at DESC, id) "
+        "INCLUDE (amount) WHERE status <> 'paid'"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_user_invoices_unpaid")
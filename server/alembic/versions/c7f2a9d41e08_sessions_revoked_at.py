@@ -0,0 +1,34 @@
+"""add revoked_at to sessions (refresh-token rotation)
+
+Revision ID: c7f2a9d41e08
+Revises: b4e1c8f7d2a1
+Create Date: 2025-10-02
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "c7f2a9d41e08"
+down_revision = "b4e1c8f7d2a1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "sessions",
+        sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # Список отозванных сессий перечитывается воркерами раз в несколько секунд.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_sessions_revoked_at "
+        "ON sessions (revoked_at) WHERE revoked_at IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_sessions_revoked_at")
+    op.drop_column("sessions", "revoked_at")
@@ -0,0 +1,32 @@
+"""auth_rate_limits table (shared login/forgot throttling)
+
+Revision ID: d3a8e5b0c912
+Revises: c7f2a9d41e08
+Create Date: 2025-10-06
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "d3a8e5b0c912"
+down_revision = "c7f2a9d41e08"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Используется только при RATE_LIMIT_BACKEND=postgres; строки живут ~2 суток.
+    op.create_table(
+        "auth_rate_limits",
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("window_start", sa.BigInteger(), nullable=False),
+        sa.Column("hits", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("key", "window_start"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("auth_rate_limits")
@@ -0,0 +1,27 @@
+"""index support_tickets (user_id, status) for support counters
+
+Revision ID: e5c1b7a93f20
+Revises: d3a8e5b0c912
+Create Date: 2025-10-08
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e5c1b7a93f20"
+down_revision = "d3a8e5b0c912"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_support_tickets_user_status "
+        "ON support_tickets (user_id, status)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_support_tickets_user_status")
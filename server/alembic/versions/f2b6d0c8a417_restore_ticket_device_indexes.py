@@ -0,0 +1,41 @@
+"""restore per-user indexes on tickets, ticket history, devices and invoices
+
+34e296af6fe9 (autogenerate) dropped ix_tickets_user_status, ix_tickets_created_desc,
+ix_ticket_history_ticket_changed and ix_devices_user_id because the models did not
+declare them; ix_user_invoices_client_id is only created by b4e1c8f7d2a1 when the table
+did not exist yet. test_query_plans.py fails on the resulting seq scans.
+
+Revision ID: f2b6d0c8a417
+Revises: e5c1b7a93f20
+Create Date: 2025-10-10
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f2b6d0c8a417"
+down_revision = "e5c1b7a93f20"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    "ix_tickets_user_status": "tickets (user_id, status)",
+    "ix_tickets_created_desc": "tickets (created_at)",
+    "ix_ticket_history_ticket_created": "ticket_status_history (ticket_id, created_at)",
+    "ix_devices_user_id": "devices (user_id)",
+    "ix_user_invoices_client_id": "user_invoices (client_id)",
+}
+
+
+def upgrade() -> None:
+    for name, target in INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+def downgrade() -> None:
+    # ix_user_invoices_client_id принадлежит b4e1c8f7d2a1
+    for name in list(INDEXES)[:-1]:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
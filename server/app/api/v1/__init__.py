@@ -14,6 +14,7 @@ from .users import router as users_router, auth_router as users_auth_router
 from .misc import router as misc_router
 from .uploads import router as uploads_router
 from .payments import router as payments_router
+from .faq import router as faq_router
 
 api_router = APIRouter()
 api_router.include_router(ping_router)           # /ping
@@ -30,3 +31,4 @@ api_router.include_router(users_router)
 api_router.include_router(invoices_router)
 api_router.include_router(uploads_router)
 api_router.include_router(payments_router)
+api_router.include_router(faq_router)            # /faq
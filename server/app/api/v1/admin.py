@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
 
 from app.core.deps import get_current_user
 from app.core.database import get_db
+from app.core import ratelimit
+from app.core.phone import normalize_phone_to_10_digits
+from app.core.ratelimit import enforce as enforce_rate_limit
+from app.services.sessions import SessionService
 from app.services.users import UserService
 from app.schemas.users import UserLogin, TokenResponse
-from app.core.security import create_access_token, create_refresh_token
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -19,17 +22,23 @@ async def admin_ping(current_user: Annotated[object, Depends(get_current_user)])
     return {"status": "admin-ok"}
 
 
+@router.get("/ratelimit", summary="Rate limiter counters")
+async def ratelimit_stats(current_user: Annotated[object, Depends(get_current_user)]):
+    # счётчики allowed/blocked/error по scope (login.ip, login.phone, forgot.*), на воркер
+    # TODO: add admin role check when roles are introduced
+    return ratelimit.snapshot()
+
+
 # Admin login endpoint
 @router.post("/login", response_model=TokenResponse)
-async def admin_login(payload: UserLogin, db: Annotated[AsyncSession, Depends(get_db)]):
+async def admin_login(payload: UserLogin, request: Request, db: Annotated[AsyncSession, Depends(get_db)]):
+    phone10 = normalize_phone_to_10_digits(payload.phone)
+    await enforce_rate_limit(request, "login", phone10)
     service = UserService(db)
-    user = await service.authenticate(payload.phone, payload.password)
+    user = await service.authenticate(phone10, payload.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     # TODO: add real admin check when roles are implemented
-    return {
-        "access_token": create_access_token(str(user.id)),
-        "refresh_token": create_refresh_token(str(user.id)),
-        "token_type": "bearer",
-    }
+    ip = request.client.host if request.client else None
+    return await SessionService(db).start(user, request.headers.get("user-agent"), ip)
 
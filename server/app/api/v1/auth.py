@@ -4,8 +4,8 @@ import logging, time, uuid
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import create_access_token, create_refresh_token
 from app.schemas.users import UserCreate, UserLogin, UserResponse, TokenResponse
+from app.services.sessions import SessionService
 from app.services.users import UserService
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -59,12 +59,10 @@ async def login(
             detail="Invalid credentials"
         )
 
-    access_token = create_access_token(str(user.id))
-    refresh_token = create_refresh_token(str(user.id))
+    tokens = await SessionService(db).start(
+        user, request.headers.get("user-agent"), request.client.host if request.client else None
+    )
     duration = int((time.perf_counter() - started) * 1000)
     auth_logger.info("LOGIN success id=%s user_id=%s dur_ms=%s", req_id, user.id, duration)
 
-    return TokenResponse(
-        access_token=access_token,
-        refresh_token=refresh_token
-    )
+    return TokenResponse(**tokens)
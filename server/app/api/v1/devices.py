@@ -2,10 +2,11 @@ from typing import Annotated, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_user
-from app.core.database import get_db
+from app.core.etag import list_etag
+from app.core.uow import UnitOfWork, UnitOfWorkRoute, get_uow
+from app.models.devices import Device
 from app.services.devices import DeviceService
 from app.schemas.devices import (
     DeviceUpdate,
@@ -14,25 +15,28 @@ from app.schemas.devices import (
     DeviceListItem,
 )
 
-router = APIRouter(prefix="/devices", tags=["devices"])
+router = APIRouter(prefix="/devices", tags=["devices"], route_class=UnitOfWorkRoute)
 
 
 # List all devices for current user (GET /devices)
-@router.get("", response_model=list[DeviceListItem])
+_devices_etag = list_etag(Device, lambda request, user: [Device.user_id == user.id])
+
+
+@router.get("", response_model=list[DeviceListItem], dependencies=[Depends(_devices_etag)])
 async def list_devices(
     current_user: Annotated[object, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    uow: Annotated[UnitOfWork, Depends(get_uow)],
 ):
-    service = DeviceService(db)
+    service = uow.service(DeviceService)
     return await service.get_user_devices(getattr(current_user, "id"))
 
 
-@router.get("/my", response_model=list[DeviceListItem])
+@router.get("/my", response_model=list[DeviceListItem], dependencies=[Depends(_devices_etag)])
 async def get_my_devices(
     current_user: Annotated[object, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    uow: Annotated[UnitOfWork, Depends(get_uow)],
 ):
-    service = DeviceService(db)
+    service = uow.service(DeviceService)
     return await service.get_user_devices(getattr(current_user, "id"))
 
 
@@ -44,7 +48,7 @@ async def search_devices(
     brand: Optional[str] = None,
     model: Optional[str] = None,
     serial_number: Optional[str] = None,
-    db: Annotated[AsyncSession, Depends(get_db)] = None,
+    uow: Annotated[UnitOfWork, Depends(get_uow)] = None,
 ):
     """Поиск без авторизации. Если user_id не указан — ищем по всей базе."""
     uid = None
@@ -61,7 +65,7 @@ async def search_devices(
         except ValueError:
             did = None
 
-    service = DeviceService(db)
+    service = uow.service(DeviceService)
     return await service.search(
         user_id=uid,
         device_id=did,
@@ -75,9 +79,9 @@ async def search_devices(
 @router.get("/{device_id}", response_model=DeviceDetail)
 async def get_device(
     device_id: UUID,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    uow: Annotated[UnitOfWork, Depends(get_uow)],
 ):
-    service = DeviceService(db)
+    service = uow.service(DeviceService)
     device = await service.get_by_id(device_id)
     if not device:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
@@ -88,9 +92,9 @@ async def get_device(
 async def update_device(
     device_id: UUID,
     payload: DeviceUpdate,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    uow: Annotated[UnitOfWork, Depends(get_uow)],
 ):
-    service = DeviceService(db)
+    service = uow.service(DeviceService)
     device = await service.get_by_id(device_id)
     if not device:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
@@ -101,14 +105,14 @@ async def update_device(
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=DeviceDetail)
 async def create_device(
     payload: DeviceCreate,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    uow: Annotated[UnitOfWork, Depends(get_uow)],
 ):
     """Создание устройства без авторизации. Требуется явный user_id в теле запроса."""
     data = payload.model_dump(exclude_unset=True)
     if not data.get("user_id"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="user_id is required")
 
-    service = DeviceService(db)
+    service = uow.service(DeviceService)
     try:
         return await service.create(data)
     except ValueError as e:
@@ -1,3 +1,4 @@
+import uuid
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -25,7 +26,7 @@ async def get_articles_by_category(
 
 @router.get("/articles/{article_id}", response_model=FAQArticleResponse)
 async def get_article(
-    article_id: str,
+    article_id: uuid.UUID,
     db: Annotated[AsyncSession, Depends(get_db)]
 ):
     service = FAQService(db)
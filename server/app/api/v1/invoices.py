@@ -1,19 +1,29 @@
 from __future__ import annotations
 
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_db, get_current_user
+from app.core.etag import list_etag
+from app.models.invoices import ManagerInvoice
 from app.models.users import User
-from app.schemas.invoices import InvoiceOut, InvoicePayRequest, InvoicePayResponse
-from app.services.invoices import InvoiceService
+from app.schemas.invoices import InvoiceOut, InvoicePage, InvoicePayRequest, InvoicePayResponse, InvoiceSummary
+from app.services.invoices import InvoiceService, visible_invoice_filters
 
 
 router = APIRouter(prefix="/invoices", tags=["invoices"])
 
 
-@router.get("/my", response_model=list[InvoiceOut])
+_invoices_etag = list_etag(
+    ManagerInvoice,
+    lambda request, user: visible_invoice_filters(
+        user.id, request.query_params.get("include_paid", "").lower() in ("1", "true", "yes", "on")
+    ),
+)
+
+
+@router.get("/my", response_model=list[InvoiceOut], dependencies=[Depends(_invoices_etag)])
 async def list_my_invoices(
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -22,6 +32,33 @@ async def list_my_invoices(
     return await InvoiceService(db).list_for_user(current_user.id, include_paid=include_paid)
 
 
+@router.get("/my/page", response_model=InvoicePage)
+async def list_my_invoices_page(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    include_paid: bool = False,
+):
+    """`/invoices/my` in keyset pages, same order and filters."""
+    try:
+        items, next_cursor = await InvoiceService(db).page_for_user(
+            current_user.id, limit, cursor=cursor, include_paid=include_paid
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return InvoicePage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/my/summary", response_model=InvoiceSummary)
+async def my_invoices_summary(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Count and total due of unpaid invoices — an aggregate, no rows are loaded."""
+    return await InvoiceService(db).unpaid_summary(current_user.id)
+
+
 @router.post("/pay", response_model=InvoicePayResponse, status_code=status.HTTP_200_OK)
 async def pay_invoices(
     payload: InvoicePayRequest,
@@ -1,29 +1,29 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request
 import logging, time, uuid
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_user
-from app.core.database import get_db
+from app.core.uow import UnitOfWork, UnitOfWorkRoute, get_uow
 from app.models.users import User
+from app.api.v1.tickets import _to_api_status
+from app.schemas.me import BootstrapResponse
+from app.schemas.tickets import TicketListResponse
 from app.schemas.users import UserProfileResponse
+from app.services.devices import DeviceService
+from app.services.invoices import InvoiceService
 from app.services.subscriptions import SubscriptionService
+from app.services.support import SupportService
+from app.services.tickets import TicketService
 
-router = APIRouter(prefix="/me", tags=["me"])
+router = APIRouter(prefix="/me", tags=["me"], route_class=UnitOfWorkRoute)
 
 
 me_logger = logging.getLogger("app.auth")
 
 
-@router.get("/", response_model=UserProfileResponse)
-async def read_profile(request: Request, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    t0 = time.perf_counter()
-    req_id = request.headers.get('x-request-id') or str(uuid.uuid4())[:8]
-    svc = SubscriptionService(db)
-    sub = await svc.get_active_for_user(user.id)
-
-    resp = UserProfileResponse(
+def _profile(user: User, sub) -> UserProfileResponse:
+    return UserProfileResponse(
         id=user.id,
         phone=user.phone,
         email=user.email,
@@ -33,5 +33,53 @@ async def read_profile(request: Request, user: User = Depends(get_current_user),
         paid_until=(sub.paid_until if sub else None),
         created_at=user.created_at,
     )
+
+
+@router.get("/", response_model=UserProfileResponse)
+async def read_profile(request: Request, user: User = Depends(get_current_user), uow: UnitOfWork = Depends(get_uow)):
+    t0 = time.perf_counter()
+    req_id = request.headers.get('x-request-id') or str(uuid.uuid4())[:8]
+    svc = uow.service(SubscriptionService)
+    sub = await svc.get_active_for_user(user.id)
+
+    resp = _profile(user, sub)
     me_logger.info("ME response id=%s user_id=%s dur_ms=%s", req_id, user.id, int((time.perf_counter()-t0)*1000))
     return resp
+
+
+@router.get("/bootstrap", response_model=BootstrapResponse)
+async def bootstrap(
+    request: Request,
+    limit: int = Query(10, ge=1, le=50, description="How many recent tickets to include"),
+    user: User = Depends(get_current_user),
+    uow: UnitOfWork = Depends(get_uow),
+):
+    """Profile, subscription, support counts, unpaid invoices, recent tickets and devices in one call.
+
+    Replaces the six requests the app makes on start. An AsyncSession can't run statements
+    concurrently, so the queries go back-to-back on one connection and one auth check.
+    """
+    t0 = time.perf_counter()
+    req_id = request.headers.get('x-request-id') or str(uuid.uuid4())[:8]
+    sub = await uow.service(SubscriptionService).get_active_for_user(user.id)
+    support = await uow.service(SupportService).counts_for_user(user.id)
+    invoices = await uow.service(InvoiceService).unpaid_summary(user.id)
+    tickets = await uow.service(TicketService).get_user_tickets(user.id, limit=limit)
+    devices = await uow.service(DeviceService).get_user_devices(user.id)
+
+    resp = BootstrapResponse(
+        profile=_profile(user, sub),
+        subscription=(
+            {"plan": sub.plan, "period": sub.period, "started_at": sub.started_at, "paid_until": sub.paid_until}
+            if sub else None
+        ),
+        support=support,
+        invoices=invoices,
+        tickets=[
+            TicketListResponse(id=t.id, title=t.title, status=_to_api_status(t.status), created_at=t.created_at)
+            for t in tickets
+        ],
+        devices=devices,
+    )
+    me_logger.info("ME bootstrap id=%s user_id=%s dur_ms=%s", req_id, user.id, int((time.perf_counter()-t0)*1000))
+    return resp
@@ -3,20 +3,20 @@ from __future__ import annotations
 import uuid
 from decimal import Decimal, ROUND_HALF_UP
 
-import httpx
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.deps import get_current_user, get_db
+from app.core.http import get_http_client
 from app.models.users import User
 from app.schemas.payments import (
     CreateInvoicePaymentRequest,
     CreateSubscriptionPaymentRequest,
     PaymentRedirectResponse,
 )
-from app.services.invoices import InvoiceService
+from app.services.invoices import InvoiceService, InvoicesNotFound
 from app.services.subscriptions import SubscriptionService
 
 
@@ -107,13 +107,12 @@ async def _create_yookassa_payment(
     }
     if receipt:
         payload["receipt"] = receipt
-    async with httpx.AsyncClient(timeout=15) as client:
-        resp = await client.post(
-            YOOKASSA_API_URL,
-            json=payload,
-            headers={"Idempotence-Key": idempotence_key},
-            auth=(settings.YOOKASSA_SHOP_ID, settings.YOOKASSA_SECRET_KEY),
-        )
+    resp = await get_http_client().post(
+        YOOKASSA_API_URL,
+        json=payload,
+        headers={"Idempotence-Key": idempotence_key},
+        auth=(settings.YOOKASSA_SHOP_ID, settings.YOOKASSA_SECRET_KEY),
+    )
     if resp.status_code >= 400:
         raise HTTPException(status_code=502, detail="YooKassa payment creation failed")
     data = resp.json()
@@ -237,13 +236,22 @@ async def yookassa_notify(request: Request, db: AsyncSession = Depends(get_db)):
             ]
         except Exception as exc:
             raise HTTPException(status_code=400, detail="Invalid invoice metadata") from exc
-        invoices = await InvoiceService(db).get_payable_invoices(user_id, invoice_ids)
-        if not invoices or len(invoices) != len(invoice_ids):
+        if not invoice_ids:
             raise HTTPException(status_code=400, detail="Invoices not found")
-        expected = sum(Decimal(str(inv.amount)) for inv in invoices)
-        if _format_amount(expected) != _format_amount(amount):
-            raise HTTPException(status_code=400, detail="Invalid amount")
-        await InvoiceService(db).pay_invoices(user_id=user_id, invoice_ids=invoice_ids, success=True)
+        # Сверка суммы и оплата — одним запросом под блокировкой строк; повтор вебхука
+        # по уже оплаченным счетам ничего не меняет и отвечает ok, а чужие/несуществующие
+        # счета — 400, чтобы платёж не был молча подтверждён.
+        try:
+            await InvoiceService(db).pay_invoices(
+                user_id=user_id,
+                invoice_ids=invoice_ids,
+                success=True,
+                expected_amount=Decimal(_format_amount(amount)),
+            )
+        except InvoicesNotFound as exc:
+            raise HTTPException(status_code=400, detail="Invoices not found") from exc
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid amount") from exc
         return {"status": "ok"}
 
     if kind == "subscription":
@@ -2,12 +2,14 @@ from __future__ import annotations
 import uuid
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy import select
 
-from app.core.database import get_db
 from app.core.deps import get_current_user
+from app.core.etag import list_etag, path_uuid
+from app.core.responses import rows_response
+from app.core.uow import UnitOfWork, UnitOfWorkRoute, get_uow
+from app.models.tickets import RequestMessage, Ticket
 from app.schemas.tickets import (
     TicketCreate,
     TicketUpdate,
@@ -38,69 +40,73 @@ def _history_item(h) -> dict:
 def _to_api_status(db_status: str) -> str:
     return _DB_TO_API.get((db_status or "").lower(), "new")
 
-router = APIRouter(prefix="/tickets", tags=["tickets"])
+router = APIRouter(prefix="/tickets", tags=["tickets"], route_class=UnitOfWorkRoute)
+
+_tickets_etag = list_etag(Ticket, lambda request, user: [Ticket.user_id == user.id])
+# сообщения только добавляются; file_url — presigned, поэтому тег ротируется раз в сутки
+_messages_etag = list_etag(
+    RequestMessage,
+    lambda request, user: [
+        RequestMessage.ticket_id == path_uuid(request, "ticket_id"),
+        Ticket.user_id == user.id,
+    ],
+    version_column="created_at",
+    join=lambda stmt: stmt.join(Ticket, Ticket.id == RequestMessage.ticket_id),
+    ttl=24 * 3600,
+)
 
 
-@router.get("/", response_model=List[TicketListResponse])
+@router.get("/", response_model=List[TicketListResponse], dependencies=[Depends(_tickets_etag)])
 async def list_my_tickets(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    uow: UnitOfWork = Depends(get_uow),
     current_user=Depends(get_current_user),
 ):
-    service = TicketService(db)
-    items = await service.get_user_tickets(current_user.id)
-    # Сузим поля под список
-    return [
-        TicketListResponse(
-            id=t.id,
-            title=t.title,
-            status=_to_api_status(t.status),
-            created_at=t.created_at,
-        )
-        for t in items
-    ]
+    rows = await uow.service(TicketService).get_user_ticket_rows(current_user.id)
+    # Сузим поля под список; строки сразу в JSON, без промежуточных Pydantic-объектов
+    return rows_response(
+        (
+            {"id": r.id, "title": r.title, "status": _to_api_status(r.status), "created_at": r.created_at}
+            for r in rows
+        ),
+        response,
+    )
 
 
 @router.post("/", response_model=TicketDetail, status_code=status.HTTP_201_CREATED)
 async def create_ticket(
     payload: TicketCreate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow),
     current_user=Depends(get_current_user),
 ):
-    service = TicketService(db)
-    ticket = await service.create(current_user.id, payload)
-    detailed = await service.get_by_id(ticket.id, user_id=current_user.id)
-    if not detailed:
-        raise HTTPException(status_code=500, detail="Ticket created but not found")
-    
-    history = await service.get_history(detailed.id)
-    # Вернем детальные данные (attachments + history через selectinload в сервисе)
-    # Map DB status -> API status on the fly
+    ticket = await uow.service(TicketService).create(current_user.id, payload)
+    # attachments и история только что созданы в этой же сессии — отвечаем из них, без перечитывания
     attachment_urls = []
-    for attachment in getattr(detailed, "attachments", []):
+    for attachment in ticket.attachments:
         raw_url = attachment.file_url
         if raw_url and not str(raw_url).startswith("http"):
             raw_url = storage_service.generate_presigned_get_url(str(raw_url))
         attachment_urls.append(raw_url)
     return TicketDetail(
-        id=detailed.id,
-        title=detailed.title,
-        status=_to_api_status(detailed.status),
-        created_at=detailed.created_at,
-        updated_at=getattr(detailed, "updated_at", None),
-        description=getattr(detailed, "description", None),
-        device_id=getattr(detailed, "device_id", None),
+        id=ticket.id,
+        title=ticket.title,
+        status=_to_api_status(ticket.status),
+        created_at=ticket.created_at,
+        updated_at=ticket.updated_at,
+        description=ticket.description,
+        device_id=getattr(ticket, "device_id", None),
         attachment_urls=attachment_urls,
-        status_history=[_history_item(h) for h in history],
+        status_history=[_history_item(h) for h in ticket.history],
     )
 
 
 @router.get("/{ticket_id}", response_model=TicketDetail)
 async def get_ticket(
     ticket_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow),
     current_user=Depends(get_current_user),
 ):
-    service = TicketService(db)
+    service = uow.service(TicketService)
     ticket = await service.get_by_id(ticket_id, user_id=current_user.id)
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket not found")
@@ -123,7 +129,7 @@ async def get_ticket(
     master_name = None
     if getattr(ticket, "assigned_master_id", None):
         from app.models.master_users import MasterUser  # type: ignore
-        master_name = await db.scalar(
+        master_name = await uow.session.scalar(
             select(MasterUser.full_name).where(MasterUser.id == ticket.assigned_master_id)
         )
     return TicketDetail(
@@ -145,10 +151,10 @@ async def get_ticket(
 async def update_ticket(
     ticket_id: uuid.UUID,
     payload: TicketUpdate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow),
     current_user=Depends(get_current_user),
 ):
-    service = TicketService(db)
+    service = uow.service(TicketService)
     ticket = await service.get_by_id(ticket_id, user_id=current_user.id)
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket not found")
@@ -166,10 +172,10 @@ async def update_ticket(
 async def update_ticket_status(
     ticket_id: uuid.UUID,
     payload: TicketStatusUpdate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow),
     current_user=Depends(get_current_user),
 ):
-    service = TicketService(db)
+    service = uow.service(TicketService)
     ticket = await service.get_by_id(ticket_id, user_id=current_user.id)
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket not found")
@@ -183,46 +189,53 @@ async def update_ticket_status(
     )
 
 
-@router.get("/{ticket_id}/messages", response_model=list[RequestMessageRead])
+@router.get("/{ticket_id}/messages", response_model=list[RequestMessageRead], dependencies=[Depends(_messages_etag)])
 async def list_ticket_messages(
     ticket_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    uow: UnitOfWork = Depends(get_uow),
     current_user=Depends(get_current_user),
 ):
-    service = TicketService(db)
+    service = uow.service(TicketService)
     ticket = await service.get_by_id(ticket_id, user_id=current_user.id)
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket not found")
 
-    from app.models.tickets import RequestMessage  # type: ignore
-    result = await db.execute(
-        select(RequestMessage)
+    result = await uow.session.execute(
+        select(
+            RequestMessage.id,
+            RequestMessage.author,
+            RequestMessage.body,
+            RequestMessage.file_key,
+            RequestMessage.created_at,
+        )
         .where(RequestMessage.ticket_id == ticket.id)
         .order_by(RequestMessage.created_at.asc())
     )
-    items = []
-    for msg in result.scalars().all():
-        items.append(
-            RequestMessageRead(
-                id=msg.id,
-                author=msg.author,
-                body=msg.body,
-                file_key=msg.file_key,
-                file_url=storage_service.generate_presigned_get_url(msg.file_key) if msg.file_key else None,
-                created_at=msg.created_at,
-            )
-        )
-    return items
+    return rows_response(
+        (
+            {
+                "id": r.id,
+                "author": r.author,
+                "body": r.body,
+                "file_key": r.file_key,
+                "file_url": storage_service.generate_presigned_get_url(r.file_key) if r.file_key else None,
+                "created_at": r.created_at,
+            }
+            for r in result
+        ),
+        response,
+    )
 
 
 @router.post("/{ticket_id}/messages", response_model=RequestMessageRead)
 async def send_ticket_message(
     ticket_id: uuid.UUID,
     payload: RequestMessageCreate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow),
     current_user=Depends(get_current_user),
 ):
-    service = TicketService(db)
+    service = uow.service(TicketService)
     ticket = await service.get_by_id(ticket_id, user_id=current_user.id)
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket not found")
@@ -240,9 +253,8 @@ async def send_ticket_message(
         body=payload.body.strip() if payload.body else None,
         file_key=payload.file_key,
     )
-    db.add(msg)
-    await db.commit()
-    await db.refresh(msg)
+    uow.session.add(msg)
+    await uow.flush()  # id/created_at — из RETURNING
     return RequestMessageRead(
         id=msg.id,
         author=msg.author,
@@ -33,6 +33,6 @@ async def direct_upload(
 
     body = await file.read()
     content_type = file.content_type or "application/octet-stream"
-    storage_service.upload_bytes(key=key, data=body, content_type=content_type)
+    await storage_service.upload_bytes(key=key, data=body, content_type=content_type)
 
     return {"file_key": key}
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import select, func
@@ -13,29 +14,33 @@ import logging
 from app.core.database import get_db
 from app.core.deps import get_current_user
 from app.core.phone import normalize_phone_to_10_digits
-from app.core.security import (
-    create_access_token,
-    create_refresh_token,
-    decode_jwt_token,
-    hash_password,
-)
+from app.core.ratelimit import enforce as enforce_rate_limit
+from app.core.uow import UnitOfWork, UnitOfWorkRoute, get_uow
+from app.core.security import hash_password
 from app.core.config import settings
 from app.core.mailer import send_email
 from app.services.users import UserService
-from app.schemas.users import UserCreate, UserLogin, UserResponse, TokenResponse
+from app.services.sessions import InvalidRefreshToken, SessionService
+from app.schemas.users import SessionOut, UserCreate, UserLogin, UserResponse, TokenResponse
 from app.models.users import User
 from app.models.password_reset_tokens import PasswordResetToken
 
 logger = logging.getLogger("app.auth")
 
-router = APIRouter(prefix="/user", tags=["user"])  # user section
+router = APIRouter(prefix="/user", tags=["user"], route_class=UnitOfWorkRoute)  # user section
 auth_router = APIRouter(prefix="/auth", tags=["user"])  # auth section
 
 
+def _client_meta(request: Request) -> tuple[str | None, str | None]:
+    ip = request.client.host if request.client else None
+    return request.headers.get("user-agent"), ip
+
+
 # 1 Registration endpoint
 @auth_router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     payload: UserCreate,
+    request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     service = UserService(db)
@@ -58,11 +63,7 @@ async def register(
         user.address,
     )
 
-    return {
-        "access_token": create_access_token(str(user.id)),
-        "refresh_token": create_refresh_token(str(user.id)),
-        "token_type": "bearer",
-    }
+    return await SessionService(db).start(user, *_client_meta(request))
 
 
 # 2.0 Forgot password (request reset link)
@@ -73,10 +74,12 @@ class ForgotPasswordRequest(BaseModel):
 @auth_router.post("/forgot", status_code=status.HTTP_204_NO_CONTENT)
 async def forgot_password(
     payload: ForgotPasswordRequest,
+    request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    """Send a one-time reset link (no plain passwords). Always 204."""
+    """Send a one-time reset link (no plain passwords). Always 204 (429 when throttled)."""
     email_norm = payload.email.strip()
+    await enforce_rate_limit(request, "forgot", email_norm)
     user = await db.scalar(select(User).where(func.lower(User.email) == func.lower(email_norm)))
     logger.info("FORGOT: request for %s; user_exists=%s", email_norm, bool(user))
     if not user:
@@ -148,18 +151,16 @@ async def reset_password(
 @auth_router.post("/login", response_model=TokenResponse)
 async def login(
     payload: UserLogin,
+    request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    service = UserService(db)
     phone10 = normalize_phone_to_10_digits(payload.phone)
+    await enforce_rate_limit(request, "login", phone10)
+    service = UserService(db)
     user = await service.authenticate(phone10, payload.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    return {
-        "access_token": create_access_token(str(user.id)),
-        "refresh_token": create_refresh_token(str(user.id)),
-        "token_type": "bearer",
-    }
+    return await SessionService(db).start(user, *_client_meta(request))
 
 
 # 2.1 Refresh tokens endpoint
@@ -170,29 +171,50 @@ class RefreshRequest(BaseModel):
 @auth_router.post("/refresh", response_model=TokenResponse)
 async def refresh_tokens(
     payload: RefreshRequest,
+    request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
+    """Rotate the refresh token: the old one stops working immediately."""
     try:
-        decoded = decode_jwt_token(payload.refresh_token)
-    except Exception:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+        return await SessionService(db).rotate(payload.refresh_token, *_client_meta(request))
+    except InvalidRefreshToken as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Invalid refresh token: {e}")
 
-    if decoded.get("typ") not in ("refresh", None):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
 
-    sub = decoded.get("sub")
-    if not sub:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
+# 2.2 Logout (this device only)
+@auth_router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    payload: RefreshRequest,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    await SessionService(db).revoke_by_token(payload.refresh_token)
+    return None
 
-    user = await db.get(User, sub) or await db.scalar(select(User).where(User.phone == str(sub)))
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
-    return {
-        "access_token": create_access_token(str(user.id)),
-        "refresh_token": create_refresh_token(str(user.id)),
-        "token_type": "bearer",
-    }
+# 2.3 Active sessions (devices) and remote logout
+@auth_router.get("/sessions", response_model=list[SessionOut])
+async def list_sessions(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    current_sid = getattr(request.state, "session_id", None)
+    sessions = await SessionService(db).list_active(current_user.id)
+    return [
+        SessionOut.model_validate(s).model_copy(update={"current": s.id == current_sid})
+        for s in sessions
+    ]
+
+
+@auth_router.delete("/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_session(
+    session_id: uuid.UUID,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    if not await SessionService(db).revoke(current_user.id, session_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+    return None
 
 
 # 3 Me about
@@ -212,9 +234,9 @@ class UserUpdateRequest(BaseModel):
 async def update_me(
     payload: UserUpdateRequest,
     current_user: Annotated[object, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    uow: Annotated[UnitOfWork, Depends(get_uow)],
 ):
-    service = UserService(db)
+    service = uow.service(UserService)
     try:
         updated = await service.update(current_user, **{k: v for k, v in payload.model_dump().items() if v is not None})
         return updated
@@ -232,9 +254,9 @@ class ChangePasswordRequest(BaseModel):
 async def change_password(
     payload: ChangePasswordRequest,
     current_user: Annotated[object, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    uow: Annotated[UnitOfWork, Depends(get_uow)],
 ):
-    service = UserService(db)
+    service = uow.service(UserService)
     ok = await service.change_password(current_user, payload.old_password, payload.new_password)
     if not ok:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Old password is incorrect")
@@ -245,8 +267,8 @@ async def change_password(
 @router.delete("", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_me(
     current_user: Annotated[object, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    uow: Annotated[UnitOfWork, Depends(get_uow)],
 ):
-    service = UserService(db)
+    service = uow.service(UserService)
     await service.delete(current_user)
     return None
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # brotli — опционально: без пакета отдаём только gzip
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/manifest+json",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def accepted_encodings(accept_encoding: str) -> dict[str, float]:
+    """Accept-Encoding -> {coding: q}."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Pick br (if available) or gzip from Accept-Encoding, honouring q=0."""
+    accepted = accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    if brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # 31 = gzip container
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress and flush, so a streamed chunk reaches the client right away."""
+        if self.encoding == "br":
+            return self._br.process(data) + self._br.flush()
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._br.process(data) + self._br.finish()
+        return self._gz.compress(data) + self._gz.flush()
+
+
+class CompressionMiddleware:
+    """gzip/brotli for API JSON and the SPA shell, independent of the reverse proxy.
+
+    Compresses only allowlisted content types, bodies of at least `minimum_size` bytes
+    (streamed responses always), and leaves responses that already carry Content-Encoding
+    (precompressed assets) untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        content_types: tuple[str, ...] = COMPRESSIBLE_TYPES,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.content_types = content_types
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _Responder(self, encoding, send)(scope, receive)
+
+
+class _Responder:
+    def __init__(self, mw: CompressionMiddleware, encoding: str, send: Send):
+        self.mw = mw
+        self.encoding = encoding
+        self.send = send
+        self.start: Message | None = None
+        self.compressor: _Compressor | None = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive) -> None:
+        await self.mw.app(scope, receive, self.send_wrapper)
+
+    def _compressible(self, start: Message) -> bool:
+        headers = Headers(raw=start["headers"])
+        if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+            return False
+        if start["status"] < 200 or start["status"] in (204, 206, 304):
+            return False
+        media_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        return any(media_type.startswith(t) for t in self.mw.content_types)
+
+    def _rewrite_headers(self, start: Message, length: int | None) -> None:
+        headers = MutableHeaders(raw=start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        if "accept-encoding" not in headers.get("vary", "").lower():
+            headers.add_vary_header("Accept-Encoding")
+        if length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(length)
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # другое представление тех же данных — сильный ETag больше не верен
+            headers["ETag"] = f"W/{etag}"
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        start, self.start = self.start, None
+        if start is not None:  # первый кусок тела: решаем, сжимать ли
+            if not self._compressible(start) or (not more_body and len(body) < self.mw.minimum_size):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            self.compressor = _Compressor(self.encoding, self.mw.gzip_level, self.mw.brotli_quality)
+            if more_body:
+                self._rewrite_headers(start, None)
+                payload = self.compressor.chunk(body)
+            else:
+                payload = self.compressor.finish(body)
+                self._rewrite_headers(start, len(payload))
+            await self.send(start)
+            await self.send({"type": "http.response.body", "body": payload, "more_body": more_body})
+            return
+
+        if self.passthrough or self.compressor is None:
+            await self.send(message)
+            return
+        payload = self.compressor.chunk(body) if more_body else self.compressor.finish(body)
+        await self.send({"type": "http.response.body", "body": payload, "more_body": more_body})
@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.security import decode_jwt_token
 from app.models.users import User
+from app.services.sessions import revocation_cache
 from app.services.users import UserService
 
 # Allow both Bearer and Basic in Swagger Authorize (we defined both in main.py)
@@ -46,6 +47,15 @@ async def get_current_user(
                 detail="Invalid token",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        # refresh-токен — только для /auth/refresh: иначе украденный refresh давал бы доступ
+        # к API на весь свой срок, мимо ротации и мимо кэша отзывов (он помнит лишь окно access-токена)
+        if payload.get("typ") == "refresh":
+            log.warning("ME token_is_refresh id=%s ip=%s", req_id, ip)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token type",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
         sub = payload.get("sub")
         if not sub:
             log.warning("ME token_bad_payload id=%s ip=%s", req_id, ip)
@@ -54,6 +64,21 @@ async def get_current_user(
                 detail="Invalid token payload",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        # Сессия отозвана (logout / reuse refresh-токена) — кэш, без запроса на каждый вызов
+        sid = payload.get("sid")
+        if sid:
+            try:
+                session_id = uuid.UUID(str(sid))
+            except ValueError:
+                session_id = None
+            if session_id is None or await revocation_cache.is_revoked(db, session_id):
+                log.warning("ME session_revoked id=%s ip=%s sid=%s", req_id, ip, sid)
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Session revoked",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            request.state.session_id = session_id
         # Try user by id, then by phone
         user = await db.get(User, sub)
         if user is None:
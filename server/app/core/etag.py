@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import hashlib
+import time
+import uuid
+from typing import Any, Callable, Iterable
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.deps import get_current_user
+from app.models.users import User
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).hexdigest()[:20]
+    # weak: тело может уйти сжатым, а версия та же
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> None:
+    """Set ETag on the response, or short-circuit with 304 if the client already has this version."""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
+def path_uuid(request: Request, name: str) -> uuid.UUID | None:
+    """Path param as UUID for scopes (runs before FastAPI validates the endpoint's own params)."""
+    try:
+        return uuid.UUID(str(request.path_params.get(name)))
+    except ValueError:
+        return None
+
+
+def list_etag(
+    model,
+    scope: Callable[[Request, User], Iterable[Any]],
+    *,
+    version_column: str = "updated_at",
+    join: Callable[[Any], Any] | None = None,
+    ttl: int | None = None,
+):
+    """Dependency factory: ETag / 304 for a per-user list endpoint.
+
+    The version token is `count(*)` + `max(version_column)` over the same rows the endpoint
+    lists (one aggregate on an indexed scope), so a 304 skips the list query and serialization.
+    `scope` must apply the endpoint's own filters; `ttl` rotates the tag for bodies that embed
+    expiring data (presigned URLs).
+    """
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db),
+    ) -> None:
+        stmt = select(func.count(), func.max(getattr(model, version_column))).select_from(model)
+        if join is not None:
+            stmt = join(stmt)
+        count, last = (await db.execute(stmt.where(*scope(request, current_user)))).one()
+        parts: list[Any] = [model.__tablename__, current_user.id, count, last]
+        if ttl:
+            parts.append(int(time.time() // ttl))
+        conditional_response(request, response, make_etag(*parts))
+
+    return dependency
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+# One pooled client per worker process (keep-alive to YooKassa etc.); closed in app lifespan.
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        import httpx  # deferred: httpx/httpcore (+ trio/anyio backends) only matter once we call out
+
+        _client = httpx.AsyncClient(timeout=15)
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
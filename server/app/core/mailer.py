@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import smtplib
 from email.message import EmailMessage
 from email.utils import formataddr
 from typing import Iterable
@@ -39,6 +38,8 @@ def _build_message(
 
 
 def _send_sync(msg: EmailMessage) -> None:
+    import smtplib  # тянет ssl/socket-обвязку; нужен только при реальной отправке
+
     host = settings.SMTP_HOST
     port = settings.SMTP_PORT or (465 if settings.SMTP_SSL else 587)
     user = settings.SMTP_USER
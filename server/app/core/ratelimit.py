@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import logging
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import text
+
+from app.core.config import settings
+
+log = logging.getLogger("app.auth")
+
+# Sliding window counter: hits in the current fixed window plus the previous window's hits
+# weighted by how much of it still overlaps the sliding window. O(1) state per key.
+
+
+@dataclass(frozen=True)
+class Limit:
+    hits: int
+    window: int  # seconds
+
+    @classmethod
+    def parse(cls, raw: str) -> "Limit":
+        """`"10/900"` -> 10 hits per 900 seconds."""
+        hits, _, window = raw.partition("/")
+        return cls(int(hits), int(window or 60))
+
+
+def _estimate(prev: int, cur: int, now: float, window: int) -> float:
+    elapsed = now % window
+    return prev * (1 - elapsed / window) + cur
+
+
+class MemoryStore:
+    """Per-process counters; each gunicorn worker limits independently."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._windows: dict[str, tuple[int, int, int]] = {}  # key -> (window_start, prev, cur)
+
+    async def hit(self, key: str, window: int, now: float) -> float:
+        start = int(now // window) * window
+        ws, prev, cur = self._windows.get(key, (start, 0, 0))
+        if ws != start:
+            prev = cur if ws == start - window else 0
+            cur = 0
+        cur += 1
+        if key not in self._windows and len(self._windows) >= self.max_keys:
+            self._evict(now)
+        self._windows[key] = (start, prev, cur)
+        return _estimate(prev, cur, now, window)
+
+    def _evict(self, now: float) -> None:
+        # ключи, у которых оба окна уже в прошлом, больше не влияют на лимит
+        stale = [k for k, (ws, _, _) in self._windows.items() if now - ws > 2 * 3600]
+        for k in stale or list(self._windows)[: self.max_keys // 10]:
+            del self._windows[k]
+
+
+class PostgresStore:
+    """Shared counters in `auth_rate_limits` so all workers/instances see the same totals."""
+
+    _HIT_SQL = text(
+        """
+        WITH cur AS (
+            INSERT INTO auth_rate_limits (key, window_start, hits)
+            VALUES (:key, :start, 1)
+            ON CONFLICT (key, window_start) DO UPDATE SET hits = auth_rate_limits.hits + 1
+            RETURNING hits
+        )
+        SELECT cur.hits,
+               COALESCE((SELECT hits FROM auth_rate_limits WHERE key = :key AND window_start = :prev), 0)
+        FROM cur
+        """
+    )
+
+    async def hit(self, key: str, window: int, now: float) -> float:
+        from app.core.database import get_engine
+
+        start = int(now // window) * window
+        async with get_engine().begin() as conn:
+            cur, prev = (await conn.execute(self._HIT_SQL, {"key": key, "start": start, "prev": start - window})).one()
+            if random.random() < 0.01:
+                await conn.execute(
+                    text("DELETE FROM auth_rate_limits WHERE window_start < :cutoff"),
+                    {"cutoff": int(now) - 2 * 86400},
+                )
+        return _estimate(prev, cur, now, window)
+
+
+class RateLimiter:
+    def __init__(self, store):
+        self.store = store
+        self.stats: Counter[str] = Counter()
+
+    async def check(self, scope: str, key: str, limit: Limit) -> float:
+        """Register a hit; return seconds to wait (0 if allowed)."""
+        now = time.time()
+        try:
+            estimate = await self.store.hit(f"{scope}:{key}", limit.window, now)
+        except Exception:
+            # лимитер не должен ронять логин, если общий стор недоступен
+            log.exception("RATELIMIT store_error scope=%s", scope)
+            self.stats[f"{scope}.error"] += 1
+            return 0.0
+        if estimate > limit.hits:
+            self.stats[f"{scope}.blocked"] += 1
+            return float(limit.window - now % limit.window)
+        self.stats[f"{scope}.allowed"] += 1
+        return 0.0
+
+
+def _build_limiter() -> RateLimiter:
+    backend = (settings.RATE_LIMIT_BACKEND or "memory").lower()
+    return RateLimiter(PostgresStore() if backend == "postgres" else MemoryStore())
+
+
+limiter = _build_limiter()
+
+LIMITS = {
+    "login.ip": Limit.parse(settings.RATE_LIMIT_LOGIN_IP),
+    "login.phone": Limit.parse(settings.RATE_LIMIT_LOGIN_PHONE),
+    "forgot.ip": Limit.parse(settings.RATE_LIMIT_FORGOT_IP),
+    "forgot.email": Limit.parse(settings.RATE_LIMIT_FORGOT_EMAIL),
+}
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "-"
+
+
+async def enforce(request: Request, action: str, identity: str | None) -> None:
+    """Raise 429 if the client IP or the account identity is over its limit.
+
+    Called at the top of the endpoint, before password hashing / e-mail sending.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    ip = client_ip(request)
+    checks = [(f"{action}.ip", ip)]
+    if identity:
+        kind = "phone" if action == "login" else "email"
+        checks.append((f"{action}.{kind}", identity.strip().lower()))
+    retry_after = 0.0
+    for scope, key in checks:
+        retry_after = max(retry_after, await limiter.check(scope, key, LIMITS[scope]))
+    if retry_after:
+        log.warning("RATELIMIT blocked action=%s ip=%s", action, ip)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+def snapshot() -> dict[str, int]:
+    return dict(limiter.stats)
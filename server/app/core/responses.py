@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any, Iterable, Mapping
+
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class JSONResponse(ORJSONResponse):
+    """Default response class: orjson, UTC datetimes as `...Z` (same as Pydantic), Decimal as number."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+        )
+
+
+def rows_response(rows: Iterable[Mapping[str, Any]], response: Response | None = None) -> JSONResponse:
+    """Serialize plain dicts straight to JSON, skipping response_model validation.
+
+    For large lists built from row tuples. Values must already match the declared
+    response_model (UUID/datetime/Enum are handled by orjson natively). Pass the endpoint's
+    `response: Response` so headers set by dependencies (ETag, ...) are kept.
+    """
+    resp = JSONResponse(rows if isinstance(rows, list) else list(rows))
+    if response is not None:
+        for key, value in response.headers.items():
+            if key not in ("content-length", "content-type"):
+                resp.headers[key] = value
+    return resp
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+
 from passlib.context import CryptContext
 
 # Support both legacy argon2 hashes and new bcrypt hashes
@@ -15,12 +17,25 @@ def hash_password(password: str) -> str:
     """Hash password using the primary scheme (bcrypt)."""
     return pwd_context.hash(password)
 
+
+async def hash_password_async(password: str) -> str:
+    """`hash_password` in a worker thread: bcrypt takes ~0.2s of CPU and would stall the event loop."""
+    return await asyncio.to_thread(hash_password, password)
+
 # --- JWT utils ---
+import base64
+import binascii
+import hashlib
+import hmac
+import json
 import os
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Union
 
 from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWTError
 
 try:
     # Prefer app settings if available
@@ -82,6 +97,83 @@ def create_refresh_token(subject: Union[str, Dict[str, Any]], expires_days: int
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+class JWTVerifier:
+    """HS256 verifier used by every auth dependency.
+
+    The HMAC state for the secret is built once and copied per token, and recently verified
+    tokens are kept in a small LRU (token -> claims) until their `exp`, so repeated requests
+    with the same access token skip base64/JSON/HMAC work entirely.
+    Raises the same python-jose exceptions as `jwt.decode`.
+    """
+
+    def __init__(self, secret: str, maxsize: int = 1024):
+        self._mac = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+        self._cache: OrderedDict[str, tuple[Dict[str, Any], float]] = OrderedDict()
+        self.maxsize = maxsize
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        now = time.time()
+        hit = self._cache.get(token)
+        if hit is not None:
+            claims, exp = hit
+            if now <= exp:
+                self._cache.move_to_end(token)
+                return dict(claims)
+            del self._cache[token]
+            raise ExpiredSignatureError("Signature has expired.")
+
+        claims = self._verify_signature_and_claims(token, now)
+        exp = claims.get("exp")
+        if exp is not None and self.maxsize:
+            self._cache[token] = (claims, float(exp))
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return dict(claims)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _verify_signature_and_claims(self, token: str, now: float) -> Dict[str, Any]:
+        try:
+            signing_input, _, signature = token.rpartition(".")
+            header_b64, _, payload_b64 = signing_input.partition(".")
+            if not (header_b64 and payload_b64 and signature):
+                raise JWTError("Not enough segments")
+            header = json.loads(_b64url_decode(header_b64))
+            if not isinstance(header, dict) or header.get("alg") != ALGORITHM:
+                raise JWTError("The specified alg value is not allowed")
+            mac = self._mac.copy()
+            mac.update(signing_input.encode("ascii"))
+            if not hmac.compare_digest(mac.digest(), _b64url_decode(signature)):
+                raise JWTError("Signature verification failed.")
+            claims = json.loads(_b64url_decode(payload_b64))
+        except (ValueError, binascii.Error) as exc:  # bad base64 / JSON / non-ascii
+            raise JWTError("Invalid token") from exc
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload")
+
+        exp = claims.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                raise JWTClaimsError("Expiration Time claim (exp) must be an integer.")
+            if now > exp:
+                raise ExpiredSignatureError("Signature has expired.")
+        nbf = claims.get("nbf")
+        if nbf is not None:
+            if not isinstance(nbf, (int, float)):
+                raise JWTClaimsError("Not Before claim (nbf) must be an integer.")
+            if nbf > now:
+                raise JWTClaimsError("The token is not yet valid (nbf)")
+        return claims
+
+
+_verifier = JWTVerifier(SECRET_KEY)
+
+
 def decode_jwt_token(token: str) -> Dict[str, Any]:
-    """Decode and validate a JWT (access or refresh). Raises jwt exceptions on failure."""
-    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
\ No newline at end of file
+    """Decode and validate a JWT (access or refresh). Raises jose exceptions on failure."""
+    return _verifier.verify(token)
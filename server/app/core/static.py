@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import os
+import re
+from email.utils import formatdate, parsedate
+from mimetypes import guess_type
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, PlainTextResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Receive, Scope, Send
+from starlette.websockets import WebSocketClose
+
+from app.core.compression import accepted_encodings
+from app.core.etag import etag_matches
+
+# Vite: `index-4f3a9c2b.js`, `logo-BxK3a_9Z.svg` — хэш содержимого в имени файла
+HASHED_NAME = re.compile(r"-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, no-cache"
+NO_STORE = "no-store, max-age=0"
+
+# порядок предпочтения заранее сжатых копий рядом с файлом
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Single `bytes=` range -> inclusive (start, end); None if not satisfiable.
+
+    Raises ValueError for syntax we don't serve (multipart ranges, other units): the caller
+    then ignores Range and sends the whole file, as RFC 9110 allows.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        raise ValueError(header)
+    first, _, last = spec.strip().partition("-")
+    if not first:  # suffix: последние N байт
+        length = int(last)
+        if length <= 0 or size == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if start >= size:
+        return None
+    end = min(int(last), size - 1) if last else size - 1
+    if start > end:
+        raise ValueError(header)
+    return start, end
+
+
+class _RangeFileResponse(FileResponse):
+    """206 Partial Content: streams only bytes start..end of the file."""
+
+    def __init__(self, path: str, start: int, end: int, **kwargs) -> None:
+        super().__init__(path, status_code=206, **kwargs)
+        self.start, self.end = start, end
+        self.headers["Content-Range"] = f"bytes {start}-{end}/{self.stat_result.st_size}"
+        self.headers["Content-Length"] = str(end - start + 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        remaining = self.end - self.start + 1
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            while remaining:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                remaining = remaining - len(chunk) if chunk else 0
+                await send({"type": "http.response.body", "body": chunk, "more_body": bool(remaining)})
+
+
+class AssetFiles(StaticFiles):
+    """StaticFiles for the Vite `dist/assets` bundle.
+
+    - content-hashed names get `immutable, max-age=1y`; anything else revalidates by ETag;
+    - `x.js.br` / `x.js.gz` next to `x.js` are served as-is when the client accepts them
+      (the compression middleware then leaves the response alone);
+    - If-None-Match / If-Modified-Since -> 304, single `Range` -> 206 / 416.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # имена ассетов неизменяемы, так что наличие .br/.gz проверяем один раз на файл
+        self._variants: dict[tuple[str, float], dict[str, tuple[str, os.stat_result]]] = {}
+
+    def _find_variants(self, full_path: str, stat_result: os.stat_result) -> dict[str, tuple[str, os.stat_result]]:
+        key = (full_path, stat_result.st_mtime)
+        found = self._variants.get(key)
+        if found is None:
+            found = {}
+            for encoding, suffix in PRECOMPRESSED:
+                try:
+                    found[encoding] = (full_path + suffix, os.stat(full_path + suffix))
+                except OSError:
+                    pass
+            self._variants[key] = found
+        return found
+
+    def cache_control(self, full_path: str) -> str:
+        return IMMUTABLE if HASHED_NAME.search(full_path) else REVALIDATE
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        full_path = os.fspath(full_path)
+        request_headers = Headers(scope=scope)
+        method = scope["method"]
+        media_type = guess_type(full_path)[0] or "text/plain"
+        headers = {"Cache-Control": self.cache_control(full_path), "Accept-Ranges": "bytes"}
+
+        path, encoding = full_path, None
+        variants = self._find_variants(full_path, stat_result)
+        if variants:
+            headers["Vary"] = "Accept-Encoding"
+            # диапазоны отдаём только по несжатому представлению
+            if "range" not in request_headers:
+                accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+                wildcard = accepted.get("*", 0.0)
+                for name, _ in PRECOMPRESSED:
+                    if name in variants and accepted.get(name, wildcard) > 0:
+                        encoding = name
+                        path, stat_result = variants[name]
+                        break
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        # у каждого представления свой ETag (mtime и размер конкретного файла)
+        headers["ETag"] = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+        headers["Last-Modified"] = formatdate(stat_result.st_mtime, usegmt=True)
+
+        if self.is_not_modified(Headers(headers), request_headers):
+            return NotModifiedResponse(Headers(headers))
+
+        range_header = request_headers.get("range")
+        if range_header and status_code == 200 and self._if_range_matches(request_headers, headers):
+            try:
+                byte_range = parse_range(range_header, stat_result.st_size)
+            except ValueError:
+                pass  # не разобрали — отдаём файл целиком
+            else:
+                if byte_range is None:
+                    return Response(
+                        status_code=416,
+                        headers={**headers, "Content-Range": f"bytes */{stat_result.st_size}"},
+                    )
+                return _RangeFileResponse(
+                    path, *byte_range, headers=headers, media_type=media_type, stat_result=stat_result, method=method
+                )
+
+        return FileResponse(
+            path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            stat_result=stat_result,
+            method=method,
+        )
+
+    def is_not_modified(self, response_headers: Headers, request_headers: Headers) -> bool:
+        # If-None-Match главнее If-Modified-Since (RFC 9110 §13.2.2)
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            return etag_matches(if_none_match, response_headers["etag"])
+        return self._not_modified_since(request_headers.get("if-modified-since"), response_headers)
+
+    @staticmethod
+    def _not_modified_since(value: str | None, response_headers: Headers) -> bool:
+        since = parsedate(value) if value else None
+        last_modified = parsedate(response_headers["last-modified"])
+        return since is not None and last_modified is not None and since >= last_modified
+
+    def _if_range_matches(self, request_headers: Headers, headers: dict[str, str]) -> bool:
+        """If-Range: serve the range only if the client's copy is still current."""
+        if_range = request_headers.get("if-range")
+        if not if_range:
+            return True
+        if if_range.startswith(('"', "W/")):
+            return if_range == headers["ETag"]
+        return if_range == headers["Last-Modified"]
+
+
+class SPAFallback(AssetFiles):
+    """Last-resort handler (`app.router.default`): runs only when no route or mount matched.
+
+    Files in the dist root (sw.js, manifest, icons, terms.pdf, ...) are looked up in an
+    in-memory index built by `load()` at startup — no stat per request — and served with
+    304/range/precompressed support. Any other GET is a client-side route and gets the
+    cached `index.html`. Missing files (path with an extension) and `/api/...` stay 404.
+    """
+
+    NO_STORE_FILES = frozenset({"index.html", "sw.js", "manifest.webmanifest"})
+
+    def __init__(self, directory: str | os.PathLike[str], exclude: tuple[str, ...] = ("assets",)) -> None:
+        super().__init__(directory=directory, check_dir=False)
+        self.dist_dir = os.fspath(directory)
+        self.exclude = exclude
+        self.files: dict[str, tuple[str, os.stat_result]] = {}
+        self.shell: bytes | None = None
+        self._loaded = False
+
+    def load(self) -> None:
+        """(Re)build the file index and cache the HTML shell."""
+        files: dict[str, tuple[str, os.stat_result]] = {}
+        for root, dirs, names in os.walk(self.dist_dir):
+            if root == self.dist_dir:
+                dirs[:] = [d for d in dirs if d not in self.exclude]
+            for name in names:
+                full_path = os.path.join(root, name)
+                rel = os.path.relpath(full_path, self.dist_dir).replace(os.sep, "/")
+                files[rel] = (full_path, os.stat(full_path))
+        self.files = files
+        index = files.get("index.html")
+        self.shell = None
+        if index is not None:
+            with open(index[0], "rb") as f:
+                self.shell = f.read()
+        self._loaded = True
+
+    def cache_control(self, full_path: str) -> str:
+        if os.path.basename(full_path) in self.NO_STORE_FILES:
+            return NO_STORE
+        return super().cache_control(full_path)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "websocket":
+            await WebSocketClose()(scope, receive, send)
+            return
+        path = scope["path"]
+        if scope["method"] not in ("GET", "HEAD") or path.startswith("/api/"):
+            raise HTTPException(status_code=404)
+        if not self._loaded:
+            self.load()
+
+        rel = path.lstrip("/")
+        found = self.files.get(rel)
+        if found is not None:
+            response = self.file_response(found[0], found[1], scope)
+        elif self.shell is None:
+            response = PlainTextResponse("Frontend build not found. Run npm run build in frontend.", status_code=503)
+        elif "." in rel.rsplit("/", 1)[-1]:
+            # несуществующий файл — не подсовываем HTML вместо js/png
+            raise HTTPException(status_code=404)
+        else:
+            response = Response(
+                content=self.shell,
+                media_type="text/html",
+                headers={"Cache-Control": NO_STORE},
+            )
+        await response(scope, receive, send)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, TypeVar
+
+from fastapi import Depends, Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+
+S = TypeVar("S")
+
+# ключ в AsyncSession.info: сессия принадлежит запросу, сервисы не коммитят сами
+UOW_KEY = "uow"
+
+
+class UnitOfWork:
+    """One session, one transaction, one commit per request.
+
+    Services built through `service()` share the request's session (and so its identity
+    map: a ticket loaded by one service is the same object for the next) and are cached per
+    class. Their `BaseService.commit()` only flushes; `UnitOfWorkRoute` commits once after
+    the endpoint returns a non-error response and before it is sent, so read-after-write
+    from the client sees the data. Errors roll everything back on session close.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.dirty = False
+        self._services: dict[type, Any] = {}
+        session.info[UOW_KEY] = self
+
+    def service(self, cls: type[S]) -> S:
+        svc = self._services.get(cls)
+        if svc is None:
+            svc = self._services[cls] = cls(self.session)
+        return svc
+
+    async def flush(self) -> None:
+        """Send pending writes now (ids, defaults, constraint errors); commit comes later."""
+        await self.session.flush()
+        self.dirty = True
+
+    async def commit(self) -> None:
+        # чистые GET не коммитим: транзакция только на чтение закроется rollback'ом
+        if self.dirty or self.session.new or self.session.dirty or self.session.deleted:
+            await self.session.commit()
+        self.dirty = False
+
+
+async def get_uow(request: Request, db: AsyncSession = Depends(get_db)) -> UnitOfWork:
+    uow = db.info.get(UOW_KEY)
+    if uow is None:
+        uow = UnitOfWork(db)
+        request.state.uow = uow
+    return uow
+
+
+class UnitOfWorkRoute(APIRoute):
+    """Route class for routers whose endpoints use `get_uow`: commits at response time."""
+
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            response = await handler(request)
+            uow: UnitOfWork | None = getattr(request.state, "uow", None)
+            if uow is not None and response.status_code < 400:
+                await uow.commit()
+            return response
+
+        return route_handler
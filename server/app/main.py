@@ -15,13 +15,32 @@ logging.getLogger("mailer").propagate = True
 
 
 logging.info("BOOT: logging configured (root=INFO)")
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, FileResponse, Response
-from fastapi.staticfiles import StaticFiles
 from app.api.v1 import api_router  # добавить импорт
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.database import dispose_engine
+from app.core.http import close_http_client
+from app.core.responses import JSONResponse
+from app.services.storage import storage_service
+from app.core.static import AssetFiles, SPAFallback
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    spa.load()
+    yield
+    # Shutdown runs after the server has drained in-flight requests (uvicorn/gunicorn graceful stop).
+    logging.info("SHUTDOWN: closing HTTP clients and DB pool")
+    await close_http_client()
+    await storage_service.close()
+    await dispose_engine()
+
 
-app = FastAPI(title="PrivetSuperApp")
+app = FastAPI(title="PrivetSuperApp", lifespan=lifespan, default_response_class=JSONResponse)
 
 # (CORS и прочее как есть)
 
@@ -36,57 +55,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Сжатие в самом приложении: docker-compose публикует uvicorn напрямую, без Caddy
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
 # --- Paths ---
 BASE_DIR = Path(__file__).resolve().parents[1]
 DIST_DIR = BASE_DIR / "frontend" / "dist"
 ASSETS_DIR = DIST_DIR / "assets"
 
-# ассеты Vite по корню
-app.mount("/assets", StaticFiles(directory=str(ASSETS_DIR)), name="assets")
-
-# SPA: index.html на /
-@app.get("/", include_in_schema=False)
-async def spa_root():
-    index_file = DIST_DIR / "index.html"
-    if index_file.exists():
-        # Disable caching for the HTML shell to avoid serving stale index.html
-        return Response(
-            content=index_file.read_text(encoding="utf-8"),
-            media_type="text/html; charset=utf-8",
-            headers={"Cache-Control": "no-store, max-age=0"},
-        )
-    return Response("Frontend build not found. Run npm run build in frontend.", status_code=503)
-
-@app.get("/terms.pdf", include_in_schema=False)
-async def terms_pdf():
-    f = DIST_DIR / "terms.pdf"
-    if f.exists():
-        return FileResponse(f, media_type="application/pdf")
-    return Response(status_code=404)
-
-# SPA fallback: любые пути — тоже index.html (для React Router)
-@app.get("/{path:path}", include_in_schema=False)
-async def spa_catch_all(path: str):
-    index_file = DIST_DIR / "index.html"
-    if index_file.exists():
-        return Response(
-            content=index_file.read_text(encoding="utf-8"),
-            media_type="text/html; charset=utf-8",
-            headers={"Cache-Control": "no-store, max-age=0"},
-        )
-    return Response("Frontend build not found. Run npm run build in frontend.", status_code=503)
-
-@app.get("/sw.js", include_in_schema=False)
-async def sw():
-    f = DIST_DIR / "sw.js"
-    if f.exists():
-        # Ensure the browser doesn't cache an outdated SW
-        return FileResponse(
-            f,
-            media_type="application/javascript",
-            headers={"Cache-Control": "no-store, max-age=0"},
-        )
-    return Response(status_code=404)
+# ассеты Vite по корню: хэшированные имена кэшируются навсегда, .br/.gz отдаются как есть
+app.mount("/assets", AssetFiles(directory=str(ASSETS_DIR)), name="assets")
+
+# SPA: всё, что не совпало ни с одним роутом/маунтом — файл из dist или index.html
+# (default роутера вызывается только после всех маршрутов, порядок объявления не важен)
+spa = SPAFallback(DIST_DIR)
+app.router.default = spa
 
 # --- Static assets from Vite ---
 # app.mount("/web/assets", StaticFiles(directory=str(ASSETS_DIR)), name="web-assets")
@@ -105,25 +89,3 @@ async def sw():
 #     if index_file.exists():
 #         return FileResponse(index_file)
 #     return Response("Frontend build not found. Run npm run build in frontend.", status_code=503)
-
-# Optional PWA files (return 404 if missing)
-@app.get("/manifest.webmanifest", include_in_schema=False)
-async def manifest():
-    f = DIST_DIR / "manifest.webmanifest"
-    if f.exists():
-        return FileResponse(f, headers={"Cache-Control": "no-store, max-age=0"})
-    return Response(status_code=404)
-
-@app.get("/icon.svg", include_in_schema=False)  
-async def icon_svg():
-    f = DIST_DIR / "icon.svg"
-    if f.exists():
-        return FileResponse(f)
-    return Response(status_code=404)
-
-@app.get("/favicon.ico", include_in_schema=False)
-async def favicon():
-    f = DIST_DIR / "favicon.ico"
-    if f.exists():
-        return FileResponse(f)
-    return Response(status_code=404)
@@ -6,6 +6,9 @@ from app.core.database import Base as CoreBase
 # Базовый класс для всех моделей
 class Base(CoreBase):
     __abstract__ = True
+    # server-side значения (now() в created_at/updated_at) приходят через RETURNING
+    # того же INSERT/UPDATE — без refresh() после записи
+    __mapper_args__ = {"eager_defaults": True}
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -10,7 +10,7 @@ class Device(Base):
     __tablename__ = "devices"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
-    user_id: Mapped[uuid.UUID] = mapped_column(UUID, ForeignKey("users.id"), nullable=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID, ForeignKey("users.id"), index=True, nullable=True)
     title: Mapped[str] = mapped_column(String)
     brand: Mapped[str] = mapped_column(String)
     model: Mapped[str] = mapped_column(String)
@@ -1,8 +1,8 @@
 from datetime import datetime
 import uuid
-from sqlalchemy import DateTime, ForeignKey, String, Text, ARRAY
+from sqlalchemy import DateTime, ForeignKey, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 
 from app.models.base import Base
 
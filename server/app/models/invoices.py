@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 
 from enum import Enum
-from sqlalchemy import DateTime, ForeignKey, Numeric, String, Text, Enum as SAEnum
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, String, Text, Enum as SAEnum, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -20,6 +20,19 @@ class InvoiceStatus(str, Enum):
 
 class ManagerInvoice(Base):
     __tablename__ = "user_invoices"
+    __table_args__ = (
+        # неоплаченные счета клиента в порядке списка (due_date, created_at desc, id);
+        # amount в INCLUDE — сводка (count/sum) идёт index-only scan
+        Index(
+            "ix_user_invoices_unpaid",
+            "client_id",
+            "due_date",
+            text("created_at DESC"),
+            "id",
+            postgresql_include=["amount"],
+            postgresql_where=text("status <> 'paid'"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     client_id: Mapped[uuid.UUID] = mapped_column(
@@ -12,9 +12,11 @@ class Session(Base):
     id: Mapped[uuid.UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
 
+    # sha256 текущего (последнего выданного) refresh-токена; сам токен не храним
     refresh_token: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     user_agent: Mapped[str | None] = mapped_column(String, nullable=True)
     ip: Mapped[str | None] = mapped_column(String, nullable=True)
 
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
-    # created_at / updated_at берём из Base
\ No newline at end of file
+    revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # created_at / updated_at берём из Base
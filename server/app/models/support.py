@@ -1,7 +1,7 @@
 # app/models/support.py
 from datetime import datetime
 import uuid
-from sqlalchemy import String, Text, DateTime, ForeignKey, Enum as SAEnum
+from sqlalchemy import String, Text, DateTime, ForeignKey, Index, Enum as SAEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from enum import Enum
@@ -19,6 +19,10 @@ class MessageAuthor(str, Enum):
 
 class SupportCase(Base):
     __tablename__ = "support_tickets"
+    __table_args__ = (
+        # счётчики для бейджа (/support/meta): index-only scan по пользователю
+        Index("ix_support_tickets_user_status", "user_id", "status"),
+    )
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), index=True, nullable=False)
     subject: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -4,7 +4,7 @@ from datetime import date, datetime
 from typing import Optional
 from uuid import uuid4, UUID
 
-from sqlalchemy import String, Text, Date, DateTime, ForeignKey, Enum as SQLEnum, func
+from sqlalchemy import String, Text, Date, DateTime, ForeignKey, Index, Enum as SQLEnum, func
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -32,6 +32,11 @@ class ChangedBy(str, Enum):
 
 class Ticket(Base):
     __tablename__ = "tickets"
+    __table_args__ = (
+        # списки заявок пользователя (GET /tickets, bootstrap); проверяет test_query_plans.py
+        Index("ix_tickets_user_status", "user_id", "status"),
+        Index("ix_tickets_created_desc", "created_at"),
+    )
 
     id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -81,6 +86,7 @@ class TicketAttachment(Base):
 
 class TicketStatusHistory(Base):
     __tablename__ = "ticket_status_history"
+    __table_args__ = (Index("ix_ticket_history_ticket_created", "ticket_id", "created_at"),)
 
     id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     ticket_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("tickets.id", ondelete="CASCADE"), nullable=False)
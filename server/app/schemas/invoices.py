@@ -16,6 +16,17 @@ class InvoiceOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class InvoicePage(BaseModel):
+    items: list[InvoiceOut]
+    next_cursor: str | None = None
+
+
+class InvoiceSummary(BaseModel):
+    count: int
+    total_amount: float
+    next_due_date: datetime | None = None
+
+
 class InvoicePayRequest(BaseModel):
     invoice_ids: list[uuid.UUID] = Field(min_length=1)
     success: bool = True
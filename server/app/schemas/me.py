@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.schemas.devices import DeviceListItem
+from app.schemas.invoices import InvoiceSummary
+from app.schemas.subscriptions import SubscriptionResponse
+from app.schemas.tickets import TicketListResponse
+from app.schemas.users import UserProfileResponse
+
+
+class SupportCounts(BaseModel):
+    active: int
+    total: int
+
+
+class BootstrapResponse(BaseModel):
+    """Everything the app needs on start, in one response."""
+
+    profile: UserProfileResponse
+    subscription: Optional[SubscriptionResponse] = None
+    support: SupportCounts
+    invoices: InvoiceSummary
+    tickets: list[TicketListResponse]
+    devices: list[DeviceListItem]
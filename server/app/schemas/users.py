@@ -32,3 +32,15 @@ class TokenResponse(BaseModel):
     access_token: str
     refresh_token: str
     token_type: str = "bearer"
+
+class SessionOut(BaseModel):
+    id: uuid.UUID
+    user_agent: Optional[str] = None
+    ip: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    expires_at: datetime
+    current: bool = False
+
+    class Config:
+        from_attributes = True
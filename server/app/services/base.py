@@ -1,5 +1,15 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.uow import UOW_KEY
+
 class BaseService:
     def __init__(self, db: AsyncSession):
         self.db = db
+
+    async def commit(self) -> None:
+        """Commit, or only flush when the session belongs to a request unit of work."""
+        uow = self.db.info.get(UOW_KEY)
+        if uow is None:
+            await self.db.commit()
+            return
+        await uow.flush()
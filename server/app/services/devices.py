@@ -8,10 +8,11 @@ from app.services.base import BaseService
 
 class DeviceService(BaseService):
     async def create(self, device_data: dict) -> Device:
-        device = Device(**device_data)
+        # у нового устройства фото нет: пустая коллекция сразу, без lazy-load при сериализации
+        device = Device(**device_data, photos=[])
         self.db.add(device)
         try:
-            await self.db.commit()
+            await self.commit()
             return device
         except IntegrityError:
             await self.db.rollback()
@@ -32,7 +33,7 @@ class DeviceService(BaseService):
     async def add_photo(self, device_id: uuid.UUID, photo_data: dict) -> DevicePhoto:
         photo = DevicePhoto(device_id=device_id, **photo_data)
         self.db.add(photo)
-        await self.db.commit()
+        await self.commit()
         return photo
 
 
@@ -41,7 +42,7 @@ class DeviceService(BaseService):
         for field, value in kwargs.items():
             if field in allowed:
                 setattr(device, field, value)
-        await self.db.commit()
+        await self.commit()
         return device
 
     async def search(
@@ -4,30 +4,102 @@ import uuid
 from typing import Sequence
 
 from datetime import datetime, timezone
+from decimal import Decimal
 
-from sqlalchemy import select, or_
+from sqlalchemy import and_, func, literal_column, select, or_, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.invoices import ManagerInvoice, InvoicePayment, InvoiceStatus
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.invoices import ManagerInvoice, InvoiceStatus
 from app.services.base import BaseService
 
 
+class InvoicesNotFound(LookupError):
+    """Some invoice ids of a captured payment do not exist or belong to another client."""
+
+
+# Литерал, а не bind-параметр: предикат должен совпасть с WHERE частичного индекса
+# ix_user_invoices_unpaid и в generic-плане подготовленного запроса.
+UNPAID = ManagerInvoice.status != literal_column(f"'{InvoiceStatus.paid.value}'")
+
+# порядок списка = порядок ix_user_invoices_unpaid; id — для однозначного курсора
+LIST_ORDER = (
+    ManagerInvoice.due_date.asc().nullslast(),
+    ManagerInvoice.created_at.desc(),
+    ManagerInvoice.id.asc(),
+)
+
+
+def visible_invoice_filters(user_id: uuid.UUID, include_paid: bool = False) -> list:
+    """Rows shown by `list_for_user` (also the ETag scope of GET /invoices/my)."""
+    now = datetime.now(timezone.utc)
+    filters = [
+        ManagerInvoice.client_id == user_id,
+        or_(ManagerInvoice.due_date.is_(None), ManagerInvoice.due_date >= now),
+    ]
+    if not include_paid:
+        filters.append(UNPAID)
+    return filters
+
+
+def _after(cursor: str):
+    """Rows strictly after the cursor in LIST_ORDER (due_date nulls last, created_at desc, id)."""
+    due_raw, created_raw, id_raw = decode_cursor(cursor, 3)
+    try:
+        due = datetime.fromisoformat(due_raw) if due_raw is not None else None
+        created = datetime.fromisoformat(created_raw)
+        last_id = uuid.UUID(id_raw)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("invalid cursor") from exc
+    m = ManagerInvoice
+    same_due_after = or_(m.created_at < created, and_(m.created_at == created, m.id > last_id))
+    if due is None:
+        return and_(m.due_date.is_(None), same_due_after)
+    return or_(m.due_date > due, m.due_date.is_(None), and_(m.due_date == due, same_due_after))
+
+
 class InvoiceService(BaseService):
     def __init__(self, db: AsyncSession):
         super().__init__(db)
 
     async def list_for_user(self, user_id: uuid.UUID, include_paid: bool = False) -> Sequence[ManagerInvoice]:
-        now = datetime.now(timezone.utc)
-        stmt = select(ManagerInvoice).where(
-            ManagerInvoice.client_id == user_id,
-            or_(ManagerInvoice.due_date.is_(None), ManagerInvoice.due_date >= now),
-        )
-        if not include_paid:
-            stmt = stmt.where(ManagerInvoice.status != InvoiceStatus.paid)
-        stmt = stmt.order_by(ManagerInvoice.due_date.asc().nullslast(), ManagerInvoice.created_at.desc())
+        stmt = select(ManagerInvoice).where(*visible_invoice_filters(user_id, include_paid)).order_by(*LIST_ORDER)
         res = await self.db.execute(stmt)
         return list(res.scalars())
 
+    async def page_for_user(
+        self,
+        user_id: uuid.UUID,
+        limit: int,
+        cursor: str | None = None,
+        include_paid: bool = False,
+    ) -> tuple[list[ManagerInvoice], str | None]:
+        """Keyset page of `list_for_user`: (rows, next cursor or None). ValueError on a bad cursor.
+
+        Unpaid pages walk ix_user_invoices_unpaid in order and stop after `limit + 1` rows.
+        """
+        stmt = select(ManagerInvoice).where(*visible_invoice_filters(user_id, include_paid))
+        if cursor:
+            stmt = stmt.where(_after(cursor))
+        res = await self.db.execute(stmt.order_by(*LIST_ORDER).limit(limit + 1))
+        rows = list(res.scalars())
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor(last.due_date, last.created_at, last.id)
+
+    async def unpaid_summary(self, user_id: uuid.UUID) -> dict:
+        """Count / total / nearest due date of the invoices `list_for_user` would show as unpaid."""
+        # только колонки ix_user_invoices_unpaid (amount — в INCLUDE): index-only scan
+        stmt = select(
+            func.count(),
+            func.coalesce(func.sum(ManagerInvoice.amount), 0),
+            func.min(ManagerInvoice.due_date),
+        ).where(*visible_invoice_filters(user_id))
+        count, total, next_due = (await self.db.execute(stmt)).one()
+        return {"count": int(count), "total_amount": float(total), "next_due_date": next_due}
+
     async def get_payable_invoices(
         self,
         user_id: uuid.UUID,
@@ -40,7 +112,7 @@ class InvoiceService(BaseService):
             ManagerInvoice.client_id == user_id,
             ManagerInvoice.id.in_(invoice_ids),
             or_(ManagerInvoice.due_date.is_(None), ManagerInvoice.due_date >= now),
-            ManagerInvoice.status != InvoiceStatus.paid,
+            UNPAID,
         )
         res = await self.db.execute(stmt)
         return list(res.scalars())
@@ -50,33 +122,59 @@ class InvoiceService(BaseService):
         user_id: uuid.UUID,
         invoice_ids: list[uuid.UUID],
         success: bool,
+        expected_amount: Decimal | None = None,
     ) -> tuple[list[uuid.UUID], list[uuid.UUID]]:
+        """Mark invoices paid and record payments in one statement.
+
+        The UPDATE takes row locks, so a concurrent retry waits and then sees status='paid'
+        and skips the row — payments are never inserted twice. If `expected_amount` is given
+        (a captured payment), every id must be an invoice of this client (else InvoicesNotFound)
+        and the total of the whole batch, paid or not, must match it (else ValueError); both roll
+        the transaction back. Only unpaid invoices are settled, so a redelivered webhook for a
+        fully or partly applied payment succeeds without paying anything twice.
+        """
         if not success:
             return [], list(invoice_ids)
+        if not invoice_ids:
+            return [], []
 
-        stmt = select(ManagerInvoice).where(
-            ManagerInvoice.client_id == user_id,
-            ManagerInvoice.id.in_(invoice_ids),
-        )
-        res = await self.db.execute(stmt)
-        invoices = list(res.scalars())
-        found_ids = {inv.id for inv in invoices}
-        skipped_ids = [inv_id for inv_id in invoice_ids if inv_id not in found_ids]
-
-        processed_ids: list[uuid.UUID] = []
-        for inv in invoices:
-            if inv.status == InvoiceStatus.paid:
-                skipped_ids.append(inv.id)
-                continue
-            inv.status = InvoiceStatus.paid
-            payment = InvoicePayment(
-                invoice_id=inv.id,
-                client_id=user_id,
-                amount=inv.amount,
-                status="success",
-            )
-            self.db.add(payment)
-            processed_ids.append(inv.id)
+        res = await self.db.execute(_SETTLE_SQL, {"user_id": user_id, "invoice_ids": list(invoice_ids)})
+        known = res.all()
+        rows = [row for row in known if row.settled]
+        if expected_amount is not None:
+            if len(known) != len(set(invoice_ids)):
+                await self.db.rollback()
+                raise InvoicesNotFound("Invoices not found")
+            total = sum((Decimal(str(row.amount)) for row in known), Decimal("0"))
+            if total != expected_amount:
+                await self.db.rollback()
+                raise ValueError("Invoice amount mismatch")
 
         await self.db.commit()
+        processed_ids = [row.id for row in rows]
+        processed = set(processed_ids)
+        skipped_ids = [inv_id for inv_id in invoice_ids if inv_id not in processed]
         return processed_ids, skipped_ids
+
+
+_SETTLE_SQL = text(
+    """
+    WITH paid AS (
+        UPDATE user_invoices
+        SET status = 'paid', updated_at = now()
+        WHERE client_id = :user_id
+          AND id = ANY(:invoice_ids)
+          AND status <> 'paid'
+        RETURNING id, amount
+    ), payments AS (
+        INSERT INTO user_invoice_payments (id, invoice_id, client_id, amount, status, paid_at)
+        SELECT gen_random_uuid(), paid.id, :user_id, paid.amount, 'success', now()
+        FROM paid
+    ), known AS (
+        -- счёт клиента независимо от статуса: «уже оплачен» отличаем от «нет такого счёта»
+        SELECT id, amount FROM user_invoices WHERE client_id = :user_id AND id = ANY(:invoice_ids)
+    )
+    SELECT known.id, known.amount, paid.id IS NOT NULL AS settled
+    FROM known LEFT JOIN paid ON paid.id = known.id
+    """
+)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import secrets
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    REFRESH_TOKEN_EXPIRE_DAYS,
+    create_access_token,
+    create_refresh_token,
+    decode_jwt_token,
+)
+from app.models.sessions import Session
+from app.models.users import User
+from app.services.base import BaseService
+
+logger = logging.getLogger("app.auth")
+
+# uuid5-пространство для сессий, в которые переведены refresh-токены без sid
+LEGACY_SESSION_NAMESPACE = uuid.UUID("5d0c1f0e-8a53-4b0e-9d43-2f6c4b1a7e21")
+
+
+class InvalidRefreshToken(Exception):
+    """Refresh token is malformed, expired, revoked or already used."""
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class RevocationCache:
+    """Per-process set of revoked session ids.
+
+    Reloaded from the DB at most once per `ttl` seconds, so `get_current_user` checks
+    revocation without a query per request. Only revocations younger than the access-token
+    lifetime matter: older access tokens for those sessions have already expired.
+    """
+
+    def __init__(self, ttl: float = 5.0):
+        self.ttl = ttl
+        self._revoked: set[uuid.UUID] = set()
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def add(self, session_id: uuid.UUID) -> None:
+        self._revoked.add(session_id)
+
+    def clear(self) -> None:
+        self._revoked.clear()
+        self._loaded_at = 0.0
+
+    async def is_revoked(self, db: AsyncSession, session_id: uuid.UUID) -> bool:
+        if time.monotonic() - self._loaded_at > self.ttl:
+            async with self._lock:
+                if time.monotonic() - self._loaded_at > self.ttl:
+                    await self._reload(db)
+        return session_id in self._revoked
+
+    async def _reload(self, db: AsyncSession) -> None:
+        res = await db.execute(
+            text(
+                "SELECT id FROM sessions "
+                "WHERE revoked_at IS NOT NULL AND revoked_at > now() - make_interval(mins => :minutes)"
+            ),
+            {"minutes": ACCESS_TOKEN_EXPIRE_MINUTES},
+        )
+        self._revoked = set(res.scalars())
+        self._loaded_at = time.monotonic()
+
+
+revocation_cache = RevocationCache()
+
+
+class SessionService(BaseService):
+    """Refresh-token sessions: one row per device, rotated on every /auth/refresh."""
+
+    def _issue(self, user_id: uuid.UUID, session_id: uuid.UUID) -> tuple[dict[str, str], str]:
+        claims = {"sub": str(user_id), "sid": str(session_id)}
+        refresh = create_refresh_token({**claims, "jti": secrets.token_urlsafe(12)})
+        tokens = {
+            "access_token": create_access_token(claims),
+            "refresh_token": refresh,
+            "token_type": "bearer",
+        }
+        return tokens, hash_token(refresh)
+
+    async def start(
+        self,
+        user: User,
+        user_agent: str | None = None,
+        ip: str | None = None,
+        session_id: uuid.UUID | None = None,
+    ) -> dict[str, str]:
+        """Open a new session (login/registration) and return the token pair."""
+        now = datetime.now(timezone.utc)
+        # попутно чистим протухшие сессии пользователя
+        await self.db.execute(delete(Session).where(Session.user_id == user.id, Session.expires_at < now))
+        session_id = session_id or uuid.uuid4()
+        tokens, token_hash = self._issue(user.id, session_id)
+        self.db.add(Session(
+            id=session_id,
+            user_id=user.id,
+            refresh_token=token_hash,
+            user_agent=(user_agent or "")[:512] or None,
+            ip=ip,
+            expires_at=now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        ))
+        await self.db.commit()
+        return tokens
+
+    async def rotate(self, refresh_token: str, user_agent: str | None = None, ip: str | None = None) -> dict[str, str]:
+        """Exchange a refresh token for a new pair.
+
+        Presenting an already rotated token means it leaked: the whole session is revoked.
+        """
+        try:
+            claims = decode_jwt_token(refresh_token)
+        except Exception as exc:
+            raise InvalidRefreshToken("invalid") from exc
+        # access-токены typ не несут — обменять их на сессию нельзя
+        if claims.get("typ") != "refresh" or not claims.get("sub"):
+            raise InvalidRefreshToken("invalid")
+
+        if not claims.get("sid"):
+            return await self._convert_legacy(refresh_token, str(claims["sub"]), user_agent, ip)
+
+        try:
+            session_id = uuid.UUID(claims["sid"])
+        except ValueError as exc:
+            raise InvalidRefreshToken("invalid") from exc
+        # FOR UPDATE: параллельные refresh одного токена выполняются по очереди
+        record = await self.db.scalar(select(Session).where(Session.id == session_id).with_for_update())
+        now = datetime.now(timezone.utc)
+        if record is None or record.revoked_at is not None or record.expires_at < now:
+            await self.db.rollback()
+            raise InvalidRefreshToken("revoked")
+        if record.refresh_token != hash_token(refresh_token):
+            await self._revoke_reused(record, ip)
+
+        tokens, token_hash = self._issue(record.user_id, session_id)
+        record.refresh_token = token_hash
+        record.expires_at = now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        record.user_agent = (user_agent or "")[:512] or record.user_agent
+        record.ip = ip or record.ip
+        await self.db.commit()
+        return tokens
+
+    async def _convert_legacy(
+        self, refresh_token: str, sub: str, user_agent: str | None, ip: str | None
+    ) -> dict[str, str]:
+        """Refresh token issued before sessions existed (no `sid`): converted into a session once.
+
+        The session id is derived from the token hash, so the session row itself records the
+        conversion: presenting the same token again is reuse and revokes that session.
+        """
+        session_id = uuid.uuid5(LEGACY_SESSION_NAMESPACE, hash_token(refresh_token))
+        record = await self.db.scalar(select(Session).where(Session.id == session_id).with_for_update())
+        if record is not None:
+            await self._revoke_reused(record, ip)
+        try:
+            user = await self.db.get(User, uuid.UUID(sub))
+        except ValueError:
+            user = await self.db.scalar(select(User).where(User.phone == sub))
+        if not user:
+            raise InvalidRefreshToken("user_not_found")
+        try:
+            return await self.start(user, user_agent, ip, session_id=session_id)
+        except IntegrityError as exc:
+            # параллельный обмен того же токена успел вставить сессию первым
+            await self.db.rollback()
+            raise InvalidRefreshToken("reused") from exc
+
+    async def _revoke_reused(self, record: Session, ip: str | None) -> None:
+        if record.revoked_at is None:
+            record.revoked_at = datetime.now(timezone.utc)
+            await self.db.commit()
+            revocation_cache.add(record.id)
+        logger.warning("REFRESH reuse_detected session_id=%s user_id=%s ip=%s", record.id, record.user_id, ip)
+        raise InvalidRefreshToken("reused")
+
+    async def list_active(self, user_id: uuid.UUID) -> list[Session]:
+        res = await self.db.scalars(
+            select(Session)
+            .where(
+                Session.user_id == user_id,
+                Session.revoked_at.is_(None),
+                Session.expires_at > datetime.now(timezone.utc),
+            )
+            .order_by(Session.updated_at.desc())
+        )
+        return list(res)
+
+    async def revoke(self, user_id: uuid.UUID, session_id: uuid.UUID) -> bool:
+        res = await self.db.execute(
+            update(Session)
+            .where(Session.id == session_id, Session.user_id == user_id, Session.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(timezone.utc))
+        )
+        await self.db.commit()
+        if not res.rowcount:
+            return False
+        revocation_cache.add(session_id)
+        return True
+
+    async def revoke_by_token(self, refresh_token: str) -> bool:
+        """Logout for the device holding this refresh token."""
+        try:
+            claims = decode_jwt_token(refresh_token)
+            session_id = uuid.UUID(claims["sid"])
+            user_id = uuid.UUID(claims["sub"])
+        except Exception:
+            return False
+        return await self.revoke(user_id, session_id)
@@ -1,16 +1,24 @@
-"""S3-compatible storage helpers (MinIO)."""
+"""S3-compatible storage helpers (MinIO).
+
+Presigned URLs/POSTs are computed locally (boto3 signer, no network). Object I/O goes over a
+pooled `httpx.AsyncClient` with SigV4-signed requests, so uploads never block the event loop.
+"""
 
 from __future__ import annotations
 
+import base64
+import hashlib
+import os
 import uuid
 from dataclasses import dataclass
-from typing import Optional
-
-import boto3
-from botocore.client import BaseClient, Config
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import quote
 
 from app.core.config import settings
-import os
+
+if TYPE_CHECKING:
+    import httpx
+    from botocore.client import BaseClient
 
 
 @dataclass
@@ -25,30 +33,66 @@ class StorageService:
         self._bucket = settings.S3_BUCKET
         self._client: Optional[BaseClient] = None
         self._public_client: Optional[BaseClient] = None
+        self._http: Optional[httpx.AsyncClient] = None
+
+    @staticmethod
+    def _make_client(endpoint_url: str) -> BaseClient:
+        # boto3/botocore грузятся ~сотни мс — импортируем при первом обращении к S3, а не на старте
+        import boto3
+        from botocore.client import Config
+
+        return boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            aws_access_key_id=settings.S3_ACCESS_KEY,
+            aws_secret_access_key=settings.S3_SECRET_KEY,
+            region_name=settings.S3_REGION,
+            config=Config(signature_version="s3v4"),
+        )
 
     def _client_or_init(self) -> BaseClient:
         if self._client is None:
-            self._client = boto3.client(
-                "s3",
-                endpoint_url=settings.S3_ENDPOINT,
-                aws_access_key_id=settings.S3_ACCESS_KEY,
-                aws_secret_access_key=settings.S3_SECRET_KEY,
-                config=Config(signature_version="s3v4"),
-            )
+            self._client = self._make_client(settings.S3_ENDPOINT)
         return self._client
 
     def _public_client_or_init(self) -> BaseClient:
         if self._public_client is None:
             public_endpoint = os.getenv("S3_PUBLIC_ENDPOINT") or getattr(settings, "S3_PUBLIC_ENDPOINT", None) or settings.S3_ENDPOINT
-            self._public_client = boto3.client(
-                "s3",
-                endpoint_url=public_endpoint,
-                aws_access_key_id=settings.S3_ACCESS_KEY,
-                aws_secret_access_key=settings.S3_SECRET_KEY,
-                config=Config(signature_version="s3v4"),
-            )
+            self._public_client = self._make_client(public_endpoint)
         return self._public_client
 
+    def _http_or_init(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            import httpx
+
+            # свой пул, а не общий get_http_client(): размер и таймауты под MinIO/S3, keep-alive между загрузками
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=settings.S3_POOL_SIZE, max_keepalive_connections=settings.S3_POOL_SIZE),
+                timeout=httpx.Timeout(settings.S3_TIMEOUT, connect=settings.S3_CONNECT_TIMEOUT),
+            )
+        return self._http
+
+    async def close(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def _object_url(self, key: str) -> str:
+        # path-style, как у boto3 с endpoint_url (MinIO); ключ кодируется так же, как его подписывает S3
+        return f"{settings.S3_ENDPOINT.rstrip('/')}/{self._bucket}/{quote(key.lstrip('/'), safe='/~')}"
+
+    async def _request(self, method: str, key: str, *, data: bytes = b"", headers: dict[str, str] | None = None) -> httpx.Response:
+        from botocore.auth import S3SigV4Auth
+        from botocore.awsrequest import AWSRequest
+        from botocore.credentials import Credentials
+
+        url = self._object_url(key)
+        request = AWSRequest(method=method, url=url, data=data, headers=headers or {})
+        S3SigV4Auth(Credentials(settings.S3_ACCESS_KEY, settings.S3_SECRET_KEY), "s3", settings.S3_REGION).add_auth(request)
+        response = await self._http_or_init().request(method, url, content=data, headers=dict(request.headers.items()))
+        response.raise_for_status()
+        return response
+
     @property
     def bucket(self) -> str:
         return self._bucket
@@ -68,10 +112,18 @@ class StorageService:
         )
         return PresignedPost(url=presigned["url"], fields=presigned["fields"], file_key=file_key)
 
-    def upload_bytes(self, *, key: str, data: bytes, content_type: str = "application/octet-stream") -> str:
-        self._client_or_init().put_object(Bucket=self._bucket, Key=key, Body=data, ContentType=content_type)
+    async def upload_bytes(self, *, key: str, data: bytes, content_type: str = "application/octet-stream") -> str:
+        # Content-MD5 как у boto3 put_object: S3 отвергнет обрезанное тело
+        md5 = base64.b64encode(hashlib.md5(data).digest()).decode()
+        await self._request("PUT", key, data=data, headers={"Content-Type": content_type, "Content-MD5": md5})
         return key
 
+    async def read_bytes(self, key: str) -> bytes:
+        return (await self._request("GET", key)).content
+
+    async def delete(self, key: str) -> None:
+        await self._request("DELETE", key)
+
     def get_public_url(self, key: str) -> str:
         public_endpoint = os.getenv("S3_PUBLIC_ENDPOINT") or getattr(settings, "S3_PUBLIC_ENDPOINT", None) or settings.S3_ENDPOINT
         return f"{public_endpoint.rstrip('/')}/{self._bucket}/{key.lstrip('/')}"
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.subscriptions import Subscription, TariffPlan, TariffPeriod
 from app.models.users import User
+from app.services.base import BaseService
 
 
 PRICES_RUB: Dict[str, Dict[str, Decimal]] = {
@@ -38,9 +39,9 @@ PLANS: List[Dict] = [
 ]
 
 
-class SubscriptionService:
+class SubscriptionService(BaseService):
     def __init__(self, db: AsyncSession):
-        self.db = db
+        super().__init__(db)
 
     async def list_plans(self) -> List[Dict]:
         return PLANS
@@ -55,7 +56,7 @@ class SubscriptionService:
     async def get_active_for_user(self, user_id) -> Subscription | None:
         now = datetime.now(timezone.utc)
         # Deactivate expired subscriptions for the user.
-        await self.db.execute(
+        expired = await self.db.execute(
             update(Subscription)
             .where(Subscription.user_id == user_id)
             .where(Subscription.active == True)  # noqa: E712
@@ -73,12 +74,15 @@ class SubscriptionService:
         sub = await self.db.scalar(stmt)
 
         # Keep the fast flag in sync.
-        await self.db.execute(
+        flag = await self.db.execute(
             update(User)
             .where(User.id == user_id)
+            .where(User.has_subscription.is_distinct_from(bool(sub)))
             .values(has_subscription=bool(sub))
         )
-        await self.db.commit()
+        # обычно ничего не поменялось — тогда чтение профиля обходится без коммита
+        if expired.rowcount or flag.rowcount:
+            await self.commit()
         return sub
 
     async def choose_plan(self, user: User, plan: str, period: str) -> Subscription:
@@ -97,5 +101,5 @@ class SubscriptionService:
         # Flip user flag for fast checks
         user.has_subscription = True
 
-        await self.db.commit()
+        await self.commit()
         return sub
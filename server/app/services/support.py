@@ -20,8 +20,7 @@ class SupportService(BaseService):
     async def create_ticket(self, user_id: uuid.UUID, data: SupportTicketCreate) -> SupportTicket:
         ticket = SupportTicket(user_id=user_id, subject=data.subject)
         self.db.add(ticket)
-        await self.db.commit()
-        await self.db.refresh(ticket)
+        await self.commit()
         return ticket
 
     async def get_ticket(self, ticket_id: uuid.UUID) -> SupportTicket | None:
@@ -36,12 +35,27 @@ class SupportService(BaseService):
         )
         return list(res.scalars())
 
+    async def list_message_rows(self, ticket_id: uuid.UUID):
+        """Message rows (no ORM objects) for the list endpoint."""
+        res = await self.db.execute(
+            select(
+                SupportMessage.id,
+                SupportMessage.ticket_id,
+                SupportMessage.author,
+                SupportMessage.body,
+                SupportMessage.file_key,
+                SupportMessage.created_at,
+            )
+            .where(SupportMessage.ticket_id == ticket_id)
+            .order_by(SupportMessage.created_at.asc())
+        )
+        return res.all()
+
     async def add_message(self, ticket_id: uuid.UUID, author: MessageAuthor, data: SupportMessageCreate) -> SupportMessage:
         body = data.body or ""
         msg = SupportMessage(ticket_id=ticket_id, author=author, body=body, file_key=data.file_key)
         self.db.add(msg)
-        await self.db.commit()
-        await self.db.refresh(msg)
+        await self.commit()
         return msg
 
     async def list_tickets_for_user(self, user_id: uuid.UUID) -> Sequence[SupportTicket]:
@@ -53,14 +67,10 @@ class SupportService(BaseService):
         return list(res.scalars())
     
     async def counts_for_user(self, user_id: uuid.UUID) -> dict[str, int]:
-        total_q = select(func.count(SupportTicket.id)).where(SupportTicket.user_id == user_id)
-        total = (await self.db.execute(total_q)).scalar_one() or 0
-
-        active_q = select(func.count(SupportTicket.id)).where(
-            SupportTicket.user_id == user_id,
-            SupportTicket.status.in_([S.open, S.pending]),
-        )
-        active = (await self.db.execute(active_q)).scalar_one() or 0
-
-        return {"active": int(active), "total": int(total)}    
-        
+        # один проход по ix_support_tickets_user_status вместо двух COUNT
+        stmt = select(
+            func.count(),
+            func.count().filter(SupportTicket.status.in_([S.open, S.pending])),
+        ).where(SupportTicket.user_id == user_id)
+        total, active = (await self.db.execute(stmt)).one()
+        return {"active": int(active or 0), "total": int(total or 0)}
@@ -6,18 +6,32 @@ from sqlalchemy.orm import selectinload
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.base import BaseService
+
 # Lazy imports inside methods will avoid circular imports with models.
 
-class TicketService:
+class TicketService(BaseService):
     def __init__(self, db: AsyncSession):
-        self.db = db
+        super().__init__(db)
 
-    async def get_user_tickets(self, user_id: uuid.UUID):
+    async def get_user_tickets(self, user_id: uuid.UUID, limit: Optional[int] = None):
         from app.models.tickets import Ticket  # type: ignore
         stmt = select(Ticket).where(Ticket.user_id == user_id).order_by(Ticket.created_at.desc())
+        if limit is not None:
+            stmt = stmt.limit(limit)
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_user_ticket_rows(self, user_id: uuid.UUID):
+        """(id, title, status, created_at) rows for list endpoints — no ORM objects."""
+        from app.models.tickets import Ticket  # type: ignore
+        stmt = (
+            select(Ticket.id, Ticket.title, Ticket.status, Ticket.created_at)
+            .where(Ticket.user_id == user_id)
+            .order_by(Ticket.created_at.desc())
+        )
+        return (await self.db.execute(stmt)).all()
+
     async def get_by_id(self, ticket_id: uuid.UUID, user_id: Optional[uuid.UUID] = None):
         from app.models.tickets import Ticket  # type: ignore
         stmt = (
@@ -45,32 +59,25 @@ class TicketService:
         # Всегда создаём тикет со статусом 'new' в БД.
         norm_status = "new"
 
-        from app.models.tickets import Ticket, TicketAttachment  # type: ignore
+        from app.models.tickets import Ticket, TicketAttachment, TicketStatusHistory, TicketStatus  # type: ignore
+        attachment_urls = getattr(payload, "attachment_urls", None) or []
+        # детей вешаем через relationship: один flush, created_at приходит из RETURNING,
+        # а ticket.attachments / ticket.history уже заполнены для ответа — без повторной загрузки
         ticket = Ticket(
             user_id=user_id,
             title=payload.title,
             description=getattr(payload, "description", None),
             status=norm_status,
+            attachments=[TicketAttachment(file_url=str(url)) for url in attachment_urls[:2] if url],
+            history=[TicketStatusHistory(
+                from_status=None,
+                to_status=TicketStatus.NEW,
+                changed_by="USER",           # ← нижний регистр, как в БД
+                comment=None,
+            )],
         )
         self.db.add(ticket)
-        await self.db.flush()
-        attachment_urls = getattr(payload, "attachment_urls", None) or []
-        for file_url in attachment_urls[:2]:
-            if not file_url:
-                continue
-            self.db.add(TicketAttachment(ticket_id=ticket.id, file_url=str(file_url)))
-        from app.models.tickets import TicketStatusHistory, TicketStatus  # локальный импорт
-
-        self.db.add(TicketStatusHistory(
-            ticket_id=ticket.id,
-            from_status=None,
-            to_status=TicketStatus.NEW,
-            changed_by="USER",           # ← нижний регистр, как в БД
-            comment=None,
-        ))
-
-        await self.db.commit()
-        await self.db.refresh(ticket)
+        await self.commit()
         return ticket
 
     async def update(self, ticket, payload):
@@ -78,9 +85,7 @@ class TicketService:
             val = getattr(payload, field, None)
             if val is not None:
                 setattr(ticket, field, val)
-        await self.db.flush()
-        await self.db.commit()
-        await self.db.refresh(ticket)
+        await self.commit()
         return ticket
 
     async def update_status(self, ticket, payload, actor_id: uuid.UUID):
@@ -100,7 +105,6 @@ class TicketService:
                 ticket.status = "rejected"
             else:
                 ticket.status = "accepted"
-        await self.db.flush()
         from app.models.tickets import TicketStatusHistory  # локальный импорт
 
         self.db.add(TicketStatusHistory(
@@ -110,8 +114,7 @@ class TicketService:
             changed_by="USER",           # ← нижний регистр
             comment=None,
         ))
-        await self.db.commit()
-        await self.db.refresh(ticket)
+        await self.commit()
         return ticket
     
     async def get_history(self, ticket_id: uuid.UUID):
@@ -4,12 +4,36 @@ from sqlalchemy import select, text
 import logging, time
 from sqlalchemy.exc import IntegrityError
 
-from app.core.security import hash_password, verify_password
+from app.core.security import hash_password, hash_password_async, verify_password
 from app.models.users import User, UserStatus
 from app.services.base import BaseService
 
 auth_logger = logging.getLogger("app.auth")
 
+# Регистрация за один запрос: пользователь + базовая запись manager_clients.
+# ON CONFLICT DO NOTHING не бросает ошибку на дубль phone/email; какой ключ занят,
+# сообщают EXISTS в том же запросе (они не видят вставку из CTE — только чужие строки).
+_REGISTER_SQL = text(
+    """
+    WITH new_user AS (
+        INSERT INTO users (id, phone, email, password_hash, name, address, status,
+                           has_subscription, created_at, updated_at)
+        VALUES (:id, :phone, :email, :password_hash, :name, :address, 'active', false, now(), now())
+        ON CONFLICT DO NOTHING
+        RETURNING id, status, created_at
+    ), client AS (
+        INSERT INTO manager_clients (id, user_id, status)
+        SELECT :client_id, id, 'new' FROM new_user
+    )
+    SELECT new_user.id, new_user.status, new_user.created_at,
+           EXISTS (SELECT 1 FROM users WHERE phone = :phone) AS phone_taken,
+           (CAST(:email AS varchar) IS NOT NULL
+            AND EXISTS (SELECT 1 FROM users WHERE email = :email)) AS email_taken
+    FROM (SELECT 1) AS one
+    LEFT JOIN new_user ON true
+    """
+)
+
 
 class UserService(BaseService):
     async def create(
@@ -40,41 +64,21 @@ class UserService(BaseService):
             address,
         )
 
-        # быстрые явные проверки дублей — для понятных сообщений
-        exists_phone = await self.db.scalar(select(User.id).where(User.phone == phone))
-        if exists_phone:
-            raise ValueError("Phone already exists")
-
-        if email:
-            exists_email = await self.db.scalar(select(User.id).where(User.email == email))
-            if exists_email:
-                raise ValueError("Email already exists")
-
-        user = User(
-            phone=phone,
-            password_hash=hash_password(password),
-            name=name,
-            email=email,
-            address=address,
-        )
-        self.db.add(user)
+        password_hash = await hash_password_async(password)
+        params = {
+            "id": uuid.uuid4(),
+            "client_id": uuid.uuid4(),
+            "phone": phone,
+            "email": email,
+            "password_hash": password_hash,
+            "name": name,
+            "address": address,
+        }
         try:
-            await self.db.flush()
-            auth_logger.info("CREATE user flushed id=%s address=%s", user.id, user.address)
-            await self._ensure_manager_client(user.id)
-            await self.db.commit()
-            auth_logger.info("CREATE user committed id=%s address=%s", user.id, user.address)
-            await self.db.refresh(user)
-            auth_logger.info("CREATE user refreshed id=%s address=%s", user.id, user.address)
-            return user
+            row = (await self.db.execute(_REGISTER_SQL, params)).one()
         except IntegrityError as e:
             await self.db.rollback()
-            # тонкая диагностика на случай гонок/других ограничений
             msg = str(getattr(e, "orig", e)).lower()
-            if "phone" in msg and "duplicate" in msg:
-                raise ValueError("Phone already exists")
-            if "email" in msg and "duplicate" in msg:
-                raise ValueError("Email already exists")
             if "null value" in msg and "name" in msg:
                 raise ValueError("Name is required")
             if "null value" in msg and "phone" in msg:
@@ -83,77 +87,35 @@ class UserService(BaseService):
         except Exception:
             await self.db.rollback()
             raise
+        if row.id is None:
+            message = await self._conflict_message(row, phone, email)
+            await self.db.rollback()
+            raise ValueError(message)
+        await self.db.commit()
 
-    async def _ensure_manager_client(self, user_id: uuid.UUID) -> None:
-        """Гарантируем, что в manager_clients есть базовая запись для пользователя.
-
-        Таблица manager_clients содержит минимум полей (id, user_id, status, assigned_manager_id, created/updated).
-        Поэтому никакие адреса/ФИО сюда не пишем — они остаются в таблице users и связанных сущностях.
-        """
-        masked_user = str(user_id)
-
-        # Если запись уже существует — просто обновим updated_at.
-        existing = await self.db.execute(
-            text("SELECT id FROM manager_clients WHERE user_id = :user_id"),
-            {"user_id": str(user_id)},
+        auth_logger.info("CREATE user committed id=%s address=%s", row.id, address)
+        return User(
+            id=row.id,
+            phone=phone,
+            email=email,
+            password_hash=password_hash,
+            name=name,
+            address=address,
+            status=row.status,
+            has_subscription=False,
+            created_at=row.created_at,
+            updated_at=row.created_at,
         )
-        manager_id = existing.scalar()
 
-        if manager_id:
-            auth_logger.info(
-                "MANAGER update existing user_id=%s (touch updated_at)",
-                masked_user,
-            )
-            try:
-                await self.db.execute(
-                    text(
-                        """
-                        UPDATE manager_clients
-                        SET updated_at = NOW()
-                        WHERE user_id = :user_id
-                        """
-                    ),
-                    {
-                        "user_id": str(user_id),
-                    },
-                )
-            except Exception as exc:
-                msg = str(getattr(exc, "orig", exc)).lower()
-                auth_logger.warning(
-                    "MANAGER touch failed for user_id=%s: %s",
-                    masked_user,
-                    msg,
-                )
-                raise
-            return
-
-        auth_logger.info(
-            "MANAGER insert new client user_id=%s",
-            masked_user,
-        )
-        payload = {
-            "id": str(uuid.uuid4()),
-            "user_id": str(user_id),
-            "status": "new",
-        }
-        try:
-            await self.db.execute(
-                text(
-                    """
-                    INSERT INTO manager_clients (id, user_id, status)
-                    VALUES (:id, :user_id, :status)
-                    """
-                ),
-                payload,
-            )
-        except Exception as exc:
-            msg = str(getattr(exc, "orig", exc)).lower()
-            auth_logger.error(
-                "MANAGER insert failed for user_id=%s: %s",
-                masked_user,
-                msg,
-            )
-            raise
+    async def _conflict_message(self, row, phone: str, email: str | None) -> str:
+        if row.phone_taken:
+            return "Phone already exists"
+        if row.email_taken:
+            return "Email already exists"
+        # дубль закоммитили параллельно, уже после снимка нашего запроса — смотрим ещё раз
+        if await self.db.scalar(select(User.id).where(User.phone == phone)):
+            return "Phone already exists"
+        return "Email already exists" if email else "Registration failed"
 
     async def authenticate(self, phone: str, password: str) -> User | None:
         t0 = time.perf_counter()
@@ -189,7 +151,7 @@ class UserService(BaseService):
     async def update(self, user: User, **kwargs) -> User:
         for key, value in kwargs.items():
             setattr(user, key, value)
-        await self.db.commit()
+        await self.commit()
         return user
 
     async def delete(self, user: User) -> None:
@@ -222,12 +184,12 @@ class UserService(BaseService):
         # 3) Помечаем пользователя как удалённого
         user.status = UserStatus.DELETED
         user.deleted_at = datetime.utcnow()
-        await self.db.commit()
+        await self.commit()
 
 
     async def change_password(self, user: User, old_password: str, new_password: str) -> bool:
         if not verify_password(old_password, user.password_hash):
             return False
         user.password_hash = hash_password(new_password)
-        await self.db.commit()
+        await self.commit()
         return True
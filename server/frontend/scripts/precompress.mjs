@@ -0,0 +1,28 @@
+// Кладёт рядом с ассетами сборки заранее сжатые копии (x.js.br, x.js.gz).
+// Бэкенд (app/core/static.py) отдаёт их как есть, без сжатия на каждый запрос.
+import { readdir, readFile, stat, writeFile } from 'node:fs/promises'
+import { join } from 'node:path'
+import { brotliCompressSync, constants, gzipSync } from 'node:zlib'
+
+const ASSETS_DIR = new URL('../dist/assets/', import.meta.url).pathname
+const COMPRESSIBLE = /\.(js|mjs|css|svg|json|html|txt|map|webmanifest)$/
+const MIN_SIZE = 1024
+
+let count = 0
+for (const name of await readdir(ASSETS_DIR)) {
+  const file = join(ASSETS_DIR, name)
+  if (!COMPRESSIBLE.test(name) || (await stat(file)).size < MIN_SIZE) continue
+  const data = await readFile(file)
+  const br = brotliCompressSync(data, {
+    params: {
+      [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY,
+      [constants.BROTLI_PARAM_SIZE_HINT]: data.length,
+    },
+  })
+  const gz = gzipSync(data, { level: 9 })
+  // сжатая копия не меньше оригинала — не нужна
+  if (br.length < data.length) await writeFile(`${file}.br`, br)
+  if (gz.length < data.length) await writeFile(`${file}.gz`, gz)
+  count += 1
+}
+console.log(`precompressed ${count} assets`)
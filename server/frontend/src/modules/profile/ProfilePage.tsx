@@ -112,6 +112,9 @@ export function ProfilePage() {
 
   const onLogout = () => {
     try {
+      const refresh = localStorage.getItem('refresh_token')
+      // отзываем сессию этого устройства на сервере (ответ не ждём)
+      if (refresh) api.post('/auth/logout', { refresh_token: refresh }).catch(() => {})
       localStorage.removeItem('access_token')
       localStorage.removeItem('refresh_token')
     } catch {}
@@ -0,0 +1,62 @@
+"""Gunicorn config for production: `gunicorn -c gunicorn.conf.py app.main:app`.
+
+Every value can be overridden via environment (the same .env the API reads).
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    return int(raw) if raw else default
+
+
+# --- Workers ---
+# Async (uvicorn) workers: один процесс на ядро, без классического 2*CPU+1.
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = _int_env("WEB_CONCURRENCY", multiprocessing.cpu_count() or 1)
+bind = os.getenv("GUNICORN_BIND", "127.0.0.1:8000")
+
+# Импортируем app в мастере: модули (fastapi, sqlalchemy, ...) шарятся между воркерами через fork/COW.
+# boto3/httpx/smtplib грузятся лениво, уже в воркере, при первом использовании (docs/STARTUP.md).
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() != "false"
+
+# --- Graceful lifecycle ---
+# SIGTERM/SIGHUP: воркер перестаёт принимать соединения и ждёт in-flight запросы до graceful_timeout,
+# затем выполняет lifespan shutdown (dispose engine, закрытие HTTP-клиентов).
+graceful_timeout = _int_env("GUNICORN_GRACEFUL_TIMEOUT", 30)
+timeout = _int_env("GUNICORN_TIMEOUT", 60)
+keepalive = _int_env("GUNICORN_KEEPALIVE", 5)
+
+# --- Per-worker limits ---
+# Перезапуск воркера после N запросов (с разбросом, чтобы не рестартовали все разом) — страховка от утечек.
+max_requests = _int_env("GUNICORN_MAX_REQUESTS", 10000)
+max_requests_jitter = _int_env("GUNICORN_MAX_REQUESTS_JITTER", 1000)
+limit_request_line = 8190
+limit_request_fields = 100
+# Жёсткий лимит адресного пространства воркера (0 — без лимита).
+worker_max_memory_mb = _int_env("GUNICORN_WORKER_MAX_MEMORY_MB", 0)
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def post_fork(server, worker) -> None:
+    if worker_max_memory_mb:
+        import resource
+
+        limit = worker_max_memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    if preload_app:
+        # Пул соединений, унаследованный от мастера, не должен использоваться в дочернем процессе.
+        from app.core.database import forget_inherited_pool
+
+        forget_inherited_pool()
+    logging.getLogger("gunicorn.error").info("worker %s forked (pid=%s)", worker.age, worker.pid)
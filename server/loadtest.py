@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный прогон основных API-сценариев.
+
+- Логинится пользователями из scripts/seed_users.py (телефоны make_phone(i), пароль PASSWORD)
+- Гоняет сценарии: login, me, tickets (create + detail + polling сообщений), devices, faq
+  (+ bootstrap — GET /me/bootstrap, включается через BENCH_SCENARIOS)
+- Печатает throughput и p50/p95/p99 по каждому запросу
+- Сохраняет результат в JSON (BENCH_OUT) и сравнивает с базовым прогоном (BENCH_BASELINE)
+
+Подготовка (локальный Postgres + MinIO, API на BASE_URL). Все пользователи логинятся с одного
+IP, поэтому API для прогона запускается без ограничителя логинов (иначе меряется 429, а не
+логин); при первом же 429 прогон останавливается с exit 1:
+
+    SEED_COUNT=200 SEED_DEVICES_PER_USER=3 SEED_TICKETS_PER_USER=5 SEED_FAQ_ARTICLES=300 \\
+        python -m scripts.seed_users
+    RATE_LIMIT_ENABLED=false uvicorn app.main:app
+    BENCH_OUT=bench.json python loadtest.py
+    BENCH_BASELINE=bench.json python loadtest.py   # exit 2, если p95 вырос сверх допуска
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import httpx
+
+from scripts.seed_users import PASSWORD, START_OFFSET, make_phone
+
+BASE = os.getenv("BASE_URL", "http://localhost:8000").rstrip("/")
+API = f"{BASE}/api/v1"
+USERS = int(os.getenv("BENCH_USERS", "50"))
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "20"))
+DURATION = float(os.getenv("BENCH_DURATION", "20"))
+SCENARIOS = [s for s in os.getenv("BENCH_SCENARIOS", "login,me,tickets,devices,faq").split(",") if s]
+POLLS = int(os.getenv("BENCH_POLLS", "3"))
+OUT = os.getenv("BENCH_OUT")
+BASELINE = os.getenv("BENCH_BASELINE")
+TOLERANCE = float(os.getenv("BENCH_TOLERANCE", "0.2"))  # +20% к p95 — регрессия
+
+
+class RateLimited(Exception):
+    """API answered 429: the run would measure the limiter instead of the endpoint."""
+
+
+@dataclass
+class Stats:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    async def timed(self, label: str, coro) -> httpx.Response | None:
+        t0 = time.perf_counter()
+        try:
+            resp = await coro
+        except httpx.HTTPError:
+            self.errors[label] += 1
+            return None
+        if resp.status_code == 429:
+            raise RateLimited(label)
+        self.latencies[label].append((time.perf_counter() - t0) * 1000)
+        if resp.status_code >= 400:
+            self.errors[label] += 1
+        return resp
+
+
+@dataclass
+class Session:
+    phone: str
+    token: str | None = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; values must be sorted."""
+    if not values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(values))
+    return values[max(0, min(len(values), rank) - 1)]
+
+
+# --- Сценарии: одна итерация = один «пользовательский» шаг ---
+
+async def scenario_login(client: httpx.AsyncClient, sess: Session, stats: Stats, n: int) -> None:
+    await stats.timed("POST /auth/login", client.post(
+        f"{API}/auth/login", json={"phone": sess.phone, "password": PASSWORD},
+    ))
+
+
+async def scenario_me(client: httpx.AsyncClient, sess: Session, stats: Stats, n: int) -> None:
+    await stats.timed("GET /me", client.get(f"{API}/me/", headers=sess.headers))
+
+
+async def scenario_bootstrap(client: httpx.AsyncClient, sess: Session, stats: Stats, n: int) -> None:
+    await stats.timed("GET /me/bootstrap", client.get(f"{API}/me/bootstrap", headers=sess.headers))
+
+
+async def scenario_tickets(client: httpx.AsyncClient, sess: Session, stats: Stats, n: int) -> None:
+    resp = await stats.timed("POST /tickets", client.post(
+        f"{API}/tickets/",
+        json={"title": f"bench #{n}", "description": "loadtest"},
+        headers=sess.headers,
+    ))
+    if resp is None or resp.status_code >= 400:
+        return
+    ticket_id = resp.json()["id"]
+    await stats.timed("GET /tickets/{id}", client.get(f"{API}/tickets/{ticket_id}", headers=sess.headers))
+    for _ in range(POLLS):
+        await stats.timed("GET /tickets/{id}/messages", client.get(
+            f"{API}/tickets/{ticket_id}/messages", headers=sess.headers,
+        ))
+    await stats.timed("GET /tickets", client.get(f"{API}/tickets/", headers=sess.headers))
+
+
+async def scenario_devices(client: httpx.AsyncClient, sess: Session, stats: Stats, n: int) -> None:
+    await stats.timed("GET /devices", client.get(f"{API}/devices", headers=sess.headers))
+    await stats.timed("GET /devices/search", client.get(
+        f"{API}/devices/search", params={"serial_number": f"{START_OFFSET + n % USERS:07d}"},
+    ))
+
+
+async def scenario_faq(client: httpx.AsyncClient, sess: Session, stats: Stats, n: int) -> None:
+    topics = ("оплата", "подписка", "заявка", "мастер")
+    await stats.timed("GET /faq/search", client.get(f"{API}/faq/search", params={"q": topics[n % len(topics)]}))
+
+
+SCENARIO_FUNCS = {
+    "login": scenario_login,
+    "me": scenario_me,
+    "bootstrap": scenario_bootstrap,
+    "tickets": scenario_tickets,
+    "devices": scenario_devices,
+    "faq": scenario_faq,
+}
+
+
+async def login_all(client: httpx.AsyncClient) -> list[Session]:
+    sessions = [Session(phone=make_phone(START_OFFSET + i)) for i in range(USERS)]
+    sem = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(sess: Session) -> None:
+        async with sem:
+            r = await client.post(f"{API}/auth/login", json={"phone": sess.phone, "password": PASSWORD})
+            if r.status_code == 429:
+                raise RateLimited("POST /auth/login")
+            if r.status_code == 200:
+                sess.token = r.json()["access_token"]
+
+    await asyncio.gather(*(one(s) for s in sessions))
+    ok = [s for s in sessions if s.token]
+    if not ok:
+        print(f"[FAIL] ни один пользователь не залогинился на {BASE} — запущен ли seed_users.py?")
+        sys.exit(1)
+    return ok
+
+
+async def run_scenario(name: str, client: httpx.AsyncClient, sessions: list[Session]) -> tuple[Stats, float]:
+    func = SCENARIO_FUNCS[name]
+    stats = Stats()
+    deadline = time.perf_counter() + DURATION
+    counter = iter(range(sys.maxsize))
+
+    async def worker(w: int) -> None:
+        while time.perf_counter() < deadline:
+            n = next(counter)
+            await func(client, sessions[(w + n) % len(sessions)], stats, n)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(CONCURRENCY)))
+    return stats, time.perf_counter() - started
+
+
+def summarize(stats: Stats, elapsed: float) -> dict[str, dict[str, float]]:
+    report = {}
+    for label, values in stats.latencies.items():
+        values.sort()
+        report[label] = {
+            "count": len(values),
+            "errors": stats.errors.get(label, 0),
+            "rps": round(len(values) / elapsed, 1),
+            "p50": round(percentile(values, 50), 2),
+            "p95": round(percentile(values, 95), 2),
+            "p99": round(percentile(values, 99), 2),
+        }
+    return report
+
+
+def compare(report: dict, baseline: dict) -> list[str]:
+    regressions = []
+    for label, cur in report.items():
+        base = baseline.get(label)
+        if not base or not base.get("p95"):
+            continue
+        if cur["p95"] > base["p95"] * (1 + TOLERANCE):
+            regressions.append(f"{label}: p95 {base['p95']}ms -> {cur['p95']}ms")
+    return regressions
+
+
+async def main() -> None:
+    try:
+        await run()
+    except RateLimited as exc:
+        print(f"[FAIL] 429 на {exc} — запустите API с RATE_LIMIT_ENABLED=false (или поднимите RATE_LIMIT_LOGIN_*)")
+        sys.exit(1)
+
+
+async def run() -> None:
+    limits = httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
+    async with httpx.AsyncClient(timeout=30, limits=limits) as client:
+        sessions = await login_all(client)
+        print(f"BASE: {BASE}  users: {len(sessions)}  concurrency: {CONCURRENCY}  duration: {DURATION}s")
+        report: dict[str, dict[str, float]] = {}
+        for name in SCENARIOS:
+            stats, elapsed = await run_scenario(name, client, sessions)
+            report.update(summarize(stats, elapsed))
+
+    print(f"\n{'request':<30}{'count':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for label, r in report.items():
+        print(f"{label:<30}{r['count']:>8}{r['errors']:>6}{r['rps']:>9}{r['p50']:>9}{r['p95']:>9}{r['p99']:>9}")
+
+    if OUT:
+        with open(OUT, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nРезультат сохранён в {OUT}")
+
+    if BASELINE:
+        with open(BASELINE, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f))
+        if regressions:
+            print(f"\nРегрессии (допуск +{int(TOLERANCE * 100)}% к p95):")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(2)
+        print("\nБез регрессий относительно базового прогона. ✅")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
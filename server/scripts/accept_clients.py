@@ -1,17 +1,27 @@
+"""
+Массово «принимает» клиентов: назначает менеджера, тариф, договор и подписку.
+
+Работает пачками по ACCEPT_CHUNK клиентов: на пачку — шесть set-based запросов
+(INSERT/UPDATE ... FROM unnest(...)) и отдельный commit, поэтому время и память
+ограничены размером пачки, а блокировки не держатся на всё время прогона.
+
+    ACCEPT_CHUNK=5000 python -m scripts.accept_clients
+"""
+
 import asyncio
 import json
+import os
 import random
-import uuid
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import select, text
+from sqlalchemy import text
 
-from app.core.database import async_session_maker
-from app.models.users import User
+from app.core.database import get_sessionmaker
 
 
 PLAN_CHOICES = ["simple", "medium", "premium"]
 PERIOD_CHOICES = ["month", "year"]
+CHUNK = int(os.getenv("ACCEPT_CHUNK", "1000"))
 
 
 def make_contract_number(client_id: str, idx: int) -> str:
@@ -19,170 +29,204 @@ def make_contract_number(client_id: str, idx: int) -> str:
     return f"DA-{short}-{idx:04d}"
 
 
+UPDATE_CLIENTS_SQL = text(
+    """
+    UPDATE manager_clients AS mc
+    SET assigned_manager_id = v.manager_id,
+        status = 'processed',
+        updated_at = now()
+    FROM unnest(CAST(:client_ids AS uuid[]), CAST(:manager_ids AS uuid[])) AS v(client_id, manager_id)
+    WHERE mc.id = v.client_id
+    """
+)
+
+UPSERT_TARIFFS_SQL = text(
+    """
+    INSERT INTO user_tariffs
+        (id, client_id, tariff_id, device_count, total_extra_fee, calculated_at, created_at, updated_at)
+    SELECT gen_random_uuid(), v.client_id, v.tariff_id, 0, 0, now(), now(), now()
+    FROM unnest(CAST(:client_ids AS uuid[]), CAST(:tariff_ids AS uuid[])) AS v(client_id, tariff_id)
+    ON CONFLICT (client_id) DO UPDATE SET
+        tariff_id = EXCLUDED.tariff_id,
+        calculated_at = now(),
+        updated_at = now()
+    """
+)
+
+UPSERT_CONTRACTS_SQL = text(
+    """
+    INSERT INTO user_contracts
+        (id, client_id, tariff_snapshot, passport_snapshot, device_snapshot,
+         signed_at, payment_confirmed_at, contract_url, contract_number,
+         signed_ip, signed_user_agent, created_at, updated_at)
+    SELECT gen_random_uuid(), v.client_id, CAST(v.tariff_snapshot AS json),
+           CAST(:passport_snapshot AS json), CAST(:device_snapshot AS json),
+           :signed_at, :signed_at, v.contract_url, v.contract_number,
+           :signed_ip, :signed_user_agent, now(), now()
+    FROM unnest(
+        CAST(:client_ids AS uuid[]), CAST(:tariff_snapshots AS text[]),
+        CAST(:contract_urls AS text[]), CAST(:contract_numbers AS text[])
+    ) AS v(client_id, tariff_snapshot, contract_url, contract_number)
+    ON CONFLICT (client_id) DO UPDATE SET
+        tariff_snapshot = EXCLUDED.tariff_snapshot,
+        passport_snapshot = EXCLUDED.passport_snapshot,
+        device_snapshot = EXCLUDED.device_snapshot,
+        signed_at = EXCLUDED.signed_at,
+        payment_confirmed_at = EXCLUDED.payment_confirmed_at,
+        contract_url = EXCLUDED.contract_url,
+        contract_number = EXCLUDED.contract_number,
+        signed_ip = EXCLUDED.signed_ip,
+        signed_user_agent = EXCLUDED.signed_user_agent,
+        updated_at = now()
+    """
+)
+
+DEACTIVATE_SUBSCRIPTIONS_SQL = text(
+    "UPDATE subscriptions SET active = false WHERE user_id = ANY(CAST(:user_ids AS uuid[])) AND active"
+)
+
+INSERT_SUBSCRIPTIONS_SQL = text(
+    """
+    INSERT INTO subscriptions
+        (id, user_id, plan, period, active, started_at, paid_until, created_at, updated_at)
+    SELECT gen_random_uuid(), v.user_id, CAST(v.plan AS tariff_plan_t), CAST(v.period AS tariff_period_t),
+           true, :started_at, v.paid_until, now(), now()
+    FROM unnest(
+        CAST(:user_ids AS uuid[]), CAST(:plans AS text[]),
+        CAST(:periods AS text[]), CAST(:paid_until AS timestamptz[])
+    ) AS v(user_id, plan, period, paid_until)
+    """
+)
+
+MARK_USERS_SQL = text(
+    "UPDATE users SET has_subscription = true WHERE id = ANY(CAST(:user_ids AS uuid[]))"
+)
+
+# Keyset-пагинация вместо загрузки всех клиентов в память; текущий тариф клиента
+# подтягиваем тем же запросом (нужен, только если в manager_tariffs пусто).
+FETCH_CHUNK_SQL = text(
+    """
+    SELECT mc.id, mc.user_id, mc.created_at,
+           ut.tariff_id, ut.device_count, ut.total_extra_fee
+    FROM manager_clients AS mc
+    LEFT JOIN user_tariffs AS ut ON ut.client_id = mc.id
+    WHERE CAST(:after_created AS timestamptz) IS NULL
+       OR (mc.created_at, mc.id) > (CAST(:after_created AS timestamptz), CAST(:after_id AS uuid))
+    ORDER BY mc.created_at ASC, mc.id ASC
+    LIMIT :limit
+    """
+)
+
+
+def build_chunk(rows, start_idx: int, managers: list, tariff_rows: list, now: datetime) -> dict:
+    params = {
+        "client_ids": [], "manager_ids": [], "tariff_client_ids": [], "tariff_ids": [],
+        "tariff_snapshots": [], "contract_urls": [], "contract_numbers": [],
+        "user_ids": [], "plans": [], "periods": [], "paid_until": [],
+    }
+    for idx, row in enumerate(rows, start=start_idx):
+        client_id = str(row["id"])
+        manager_id = str(managers[idx % len(managers)]) if managers else None
+        tariff = random.choice(tariff_rows) if tariff_rows else None
+        if tariff:
+            tariff_snapshot = {
+                "id": str(tariff["id"]),
+                "name": tariff["name"],
+                "base_fee": str(tariff["base_fee"]),
+                "extra_per_device": str(tariff["extra_per_device"]),
+            }
+            params["tariff_client_ids"].append(client_id)
+            params["tariff_ids"].append(str(tariff["id"]))
+        else:
+            tariff_snapshot = {
+                "tariff_id": str(row["tariff_id"]) if row["tariff_id"] else None,
+                "device_count": int(row["device_count"] or 0),
+                "total_extra_fee": str(row["total_extra_fee"] if row["total_extra_fee"] is not None else 0),
+                "placeholder": True,
+            }
+        contract_number = make_contract_number(client_id, idx)
+        plan = random.choice(PLAN_CHOICES)
+        period = random.choice(PERIOD_CHOICES)
+
+        params["client_ids"].append(client_id)
+        params["manager_ids"].append(manager_id)
+        params["tariff_snapshots"].append(json.dumps(tariff_snapshot))
+        params["contract_urls"].append(f"https://app.privetsuper.ru/contracts/{contract_number}.pdf")
+        params["contract_numbers"].append(contract_number)
+        params["user_ids"].append(str(row["user_id"]))
+        params["plans"].append(plan)
+        params["periods"].append(period)
+        params["paid_until"].append(now + (timedelta(days=365) if period == "year" else timedelta(days=30)))
+    return params
+
+
+async def accept_chunk(session, p: dict, now: datetime) -> None:
+    await session.execute(UPDATE_CLIENTS_SQL, {"client_ids": p["client_ids"], "manager_ids": p["manager_ids"]})
+    if p["tariff_client_ids"]:
+        await session.execute(
+            UPSERT_TARIFFS_SQL, {"client_ids": p["tariff_client_ids"], "tariff_ids": p["tariff_ids"]}
+        )
+    await session.execute(
+        UPSERT_CONTRACTS_SQL,
+        {
+            "client_ids": p["client_ids"],
+            "tariff_snapshots": p["tariff_snapshots"],
+            "contract_urls": p["contract_urls"],
+            "contract_numbers": p["contract_numbers"],
+            "passport_snapshot": json.dumps({"placeholder": True}),
+            "device_snapshot": json.dumps({"placeholder": True}),
+            "signed_at": now,
+            "signed_ip": "127.0.0.1",
+            "signed_user_agent": "seed-script",
+        },
+    )
+    await session.execute(DEACTIVATE_SUBSCRIPTIONS_SQL, {"user_ids": p["user_ids"]})
+    await session.execute(
+        INSERT_SUBSCRIPTIONS_SQL,
+        {
+            "user_ids": p["user_ids"],
+            "plans": p["plans"],
+            "periods": p["periods"],
+            "paid_until": p["paid_until"],
+            "started_at": now,
+        },
+    )
+    await session.execute(MARK_USERS_SQL, {"user_ids": p["user_ids"]})
+
+
 async def main() -> None:
     random.seed(42)
     now = datetime.now(timezone.utc)
 
-    async with async_session_maker() as session:
+    async with get_sessionmaker()() as session:
         managers = (await session.execute(text("SELECT id FROM manager_users WHERE is_active = true"))).scalars().all()
         tariffs = await session.execute(
             text("SELECT id, name, base_fee, extra_per_device FROM manager_tariffs")
         )
         tariff_rows = list(tariffs.mappings())
-
-        clients = await session.execute(text("SELECT id, user_id FROM manager_clients ORDER BY created_at ASC"))
-        client_rows = list(clients.mappings())
-        if not client_rows:
+        total = (await session.execute(text("SELECT count(*) FROM manager_clients"))).scalar_one()
+        if not total:
             print("No manager_clients found. Aborting.")
             return
 
         created = 0
-        for idx, row in enumerate(client_rows, start=1):
-            client_id = str(row["id"])
-            user_id = str(row["user_id"])
-            manager_id = str(managers[idx % len(managers)]) if managers else None
-            tariff = random.choice(tariff_rows) if tariff_rows else None
-            if tariff:
-                tariff_snapshot = {
-                    "id": str(tariff["id"]),
-                    "name": tariff["name"],
-                    "base_fee": str(tariff["base_fee"]),
-                    "extra_per_device": str(tariff["extra_per_device"]),
-                }
-            else:
-                ut = await session.execute(
-                    text(
-                        """
-                        SELECT tariff_id, device_count, total_extra_fee
-                        FROM user_tariffs
-                        WHERE client_id = :client_id
-                        """
-                    ),
-                    {"client_id": client_id},
-                )
-                ut_row = ut.mappings().first()
-                tariff_snapshot = {
-                    "tariff_id": str(ut_row["tariff_id"]) if ut_row and ut_row["tariff_id"] else None,
-                    "device_count": int(ut_row["device_count"]) if ut_row else 0,
-                    "total_extra_fee": str(ut_row["total_extra_fee"]) if ut_row else "0",
-                    "placeholder": True,
-                }
-            passport_snapshot = {"placeholder": True}
-            device_snapshot = {"placeholder": True}
-
-            contract_number = make_contract_number(client_id, idx)
-            contract_url = f"https://app.privetsuper.ru/contracts/{contract_number}.pdf"
-
-            plan = random.choice(PLAN_CHOICES)
-            period = random.choice(PERIOD_CHOICES)
-            paid_until = now + (timedelta(days=365) if period == "year" else timedelta(days=30))
-
-            await session.execute(
-                text(
-                    """
-                    UPDATE manager_clients
-                    SET assigned_manager_id = :manager_id,
-                        status = 'processed',
-                        updated_at = now()
-                    WHERE id = :client_id
-                    """
-                ),
-                {"manager_id": manager_id, "client_id": client_id},
-            )
-
-            if tariff:
-                await session.execute(
-                    text(
-                        """
-                        INSERT INTO user_tariffs
-                            (id, client_id, tariff_id, device_count, total_extra_fee, calculated_at, created_at, updated_at)
-                        VALUES
-                            (:id, :client_id, :tariff_id, 0, 0, now(), now(), now())
-                        ON CONFLICT (client_id) DO UPDATE SET
-                            tariff_id = EXCLUDED.tariff_id,
-                            calculated_at = now(),
-                            updated_at = now()
-                        """
-                    ),
-                    {
-                        "id": str(uuid.uuid4()),
-                        "client_id": client_id,
-                        "tariff_id": str(tariff["id"]),
-                    },
-                )
-
-            await session.execute(
-                text(
-                    """
-                    INSERT INTO user_contracts
-                        (id, client_id, tariff_snapshot, passport_snapshot, device_snapshot,
-                         signed_at, payment_confirmed_at, contract_url, contract_number,
-                         signed_ip, signed_user_agent, created_at, updated_at)
-                    VALUES
-                        (:id, :client_id, CAST(:tariff_snapshot AS json), CAST(:passport_snapshot AS json), CAST(:device_snapshot AS json),
-                         :signed_at, :payment_confirmed_at, :contract_url, :contract_number,
-                         :signed_ip, :signed_user_agent, now(), now())
-                    ON CONFLICT (client_id) DO UPDATE SET
-                        tariff_snapshot = EXCLUDED.tariff_snapshot,
-                        passport_snapshot = EXCLUDED.passport_snapshot,
-                        device_snapshot = EXCLUDED.device_snapshot,
-                        signed_at = EXCLUDED.signed_at,
-                        payment_confirmed_at = EXCLUDED.payment_confirmed_at,
-                        contract_url = EXCLUDED.contract_url,
-                        contract_number = EXCLUDED.contract_number,
-                        signed_ip = EXCLUDED.signed_ip,
-                        signed_user_agent = EXCLUDED.signed_user_agent,
-                        updated_at = now()
-                    """
-                ),
-                {
-                    "id": str(uuid.uuid4()),
-                    "client_id": client_id,
-                    "tariff_snapshot": json.dumps(tariff_snapshot),
-                    "passport_snapshot": json.dumps(passport_snapshot),
-                    "device_snapshot": json.dumps(device_snapshot),
-                    "signed_at": now,
-                    "payment_confirmed_at": now,
-                    "contract_url": contract_url,
-                    "contract_number": contract_number,
-                    "signed_ip": "127.0.0.1",
-                    "signed_user_agent": "seed-script",
-                },
-            )
-
-            await session.execute(
-                text("UPDATE subscriptions SET active = false WHERE user_id = :user_id"),
-                {"user_id": user_id},
-            )
-            await session.execute(
-                text(
-                    """
-                    INSERT INTO subscriptions
-                        (id, user_id, plan, period, active, started_at, paid_until, created_at, updated_at)
-                    VALUES
-                        (:id, :user_id, :plan, :period, true, :started_at, :paid_until, now(), now())
-                    """
-                ),
-                {
-                    "id": str(uuid.uuid4()),
-                    "user_id": user_id,
-                    "plan": plan,
-                    "period": period,
-                    "started_at": now,
-                    "paid_until": paid_until,
-                },
-            )
-            await session.execute(
-                text("UPDATE users SET has_subscription = true WHERE id = :user_id"),
-                {"user_id": user_id},
-            )
-
-            created += 1
-            if created % 50 == 0:
-                print(f"progress: {created}/{len(client_rows)}")
-
-        await session.commit()
-        print(f"done: {created}/{len(client_rows)}")
+        after_created, after_id = None, None
+        while True:
+            rows = list((await session.execute(
+                FETCH_CHUNK_SQL,
+                {"after_created": after_created, "after_id": after_id, "limit": CHUNK},
+            )).mappings())
+            if not rows:
+                break
+            params = build_chunk(rows, created + 1, managers, tariff_rows, now)
+            await accept_chunk(session, params, now)
+            await session.commit()
+
+            created += len(rows)
+            after_created, after_id = rows[-1]["created_at"], str(rows[-1]["id"])
+            print(f"progress: {created}/{total}")
+
+        print(f"done: {created}/{total}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+"""
+Бенчмарк сериализации списков (1k элементов по умолчанию) через полный стек FastAPI:
+
+- pydantic + JSONResponse    — как было: Pydantic-объект на элемент, response_model, stdlib json
+- pydantic + orjson          — то же, но default_response_class=JSONResponse (orjson)
+- rows + orjson              — rows_response(): dict из строки запроса сразу в orjson
+
+    python -m scripts.bench_json
+    BENCH_JSON_ITEMS=5000 BENCH_JSON_N=200 python -m scripts.bench_json
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse as StdJSONResponse
+
+from app.core.responses import JSONResponse, rows_response
+from app.schemas.tickets import RequestMessageRead
+
+ITEMS = int(os.getenv("BENCH_JSON_ITEMS", "1000"))
+N = int(os.getenv("BENCH_JSON_N", "300"))
+
+
+def make_rows() -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "author": "user" if i % 2 else "master",
+            "body": f"Сообщение {i}: мастер будет завтра с 10 до 12",
+            "file_key": None,
+            "file_url": None,
+            "created_at": now - timedelta(minutes=i),
+        }
+        for i in range(ITEMS)
+    ]
+
+
+def build_app(rows: list[dict], response_class) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/pydantic", response_model=list[RequestMessageRead])
+    async def pydantic_list():
+        return [RequestMessageRead(**row) for row in rows]
+
+    @app.get("/rows", response_model=list[RequestMessageRead])
+    async def rows_list():
+        return rows_response(rows)
+
+    return app
+
+
+async def bench(label: str, app: FastAPI, path: str) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        body = (await client.get(path)).content
+        started = time.perf_counter()
+        for _ in range(N):
+            await client.get(path)
+        elapsed = (time.perf_counter() - started) / N
+    print(f"{label:<28}{elapsed * 1000:>9.2f} ms/req{len(body) / 1024:>9.1f} KiB")
+    return elapsed
+
+
+async def main() -> None:
+    rows = make_rows()
+    print(f"items={ITEMS} requests={N}")
+    base = await bench("pydantic + JSONResponse", build_app(rows, StdJSONResponse), "/pydantic")
+    orj = await bench("pydantic + orjson", build_app(rows, JSONResponse), "/pydantic")
+    fast = await bench("rows + orjson", build_app(rows, JSONResponse), "/rows")
+    print(f"\nspeedup: orjson x{base / orj:.1f}, rows x{base / fast:.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
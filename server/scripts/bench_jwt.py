@@ -0,0 +1,45 @@
+"""
+Микробенчмарк проверки JWT: python-jose `jwt.decode` против `decode_jwt_token`
+(предсобранный HMAC + LRU проверенных токенов).
+
+    python -m scripts.bench_jwt
+    BENCH_JWT_N=200000 BENCH_JWT_TOKENS=50 python -m scripts.bench_jwt
+"""
+
+import os
+import time
+import uuid
+
+from jose import jwt
+
+from app.core.security import ALGORITHM, SECRET_KEY, JWTVerifier, create_access_token, decode_jwt_token
+
+N = int(os.getenv("BENCH_JWT_N", "50000"))
+# Сколько разных токенов крутится одновременно (≈ активных пользователей на воркер)
+TOKENS = int(os.getenv("BENCH_JWT_TOKENS", "100"))
+
+
+def bench(label: str, func, tokens: list[str]) -> float:
+    started = time.perf_counter()
+    for i in range(N):
+        func(tokens[i % len(tokens)])
+    elapsed = time.perf_counter() - started
+    print(f"{label:<32}{N / elapsed:>12,.0f} ops/s{elapsed / N * 1e6:>10.2f} µs/op")
+    return elapsed
+
+
+def main() -> None:
+    tokens = [create_access_token({"sub": str(uuid.uuid4()), "sid": str(uuid.uuid4())}) for _ in range(TOKENS)]
+    for token in tokens:
+        assert decode_jwt_token(token) == jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+    print(f"N={N} tokens={TOKENS}")
+    base = bench("jose jwt.decode", lambda t: jwt.decode(t, SECRET_KEY, algorithms=[ALGORITHM]), tokens)
+    uncached = JWTVerifier(SECRET_KEY, maxsize=0)
+    cold = bench("JWTVerifier (no cache)", uncached.verify, tokens)
+    warm = bench("decode_jwt_token (LRU)", decode_jwt_token, tokens)
+    print(f"\nspeedup: no cache x{base / cold:.1f}, LRU x{base / warm:.1f}")
+
+
+if __name__ == "__main__":
+    main()
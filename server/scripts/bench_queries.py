@@ -0,0 +1,97 @@
+"""
+Латентность горячих запросов при разных настройках драйвера:
+
+- no prepare, no cache   — prepare_threshold выключен, compiled cache SQLAlchemy = 0
+- no prepare             — только compiled cache (DB_COMPILED_CACHE_SIZE)
+- prepared               — + серверные prepared statements (DB_PREPARE_THRESHOLD, по умолчанию 2)
+
+Запросы — те же, что делают сервисы: пользователь по id (каждый авторизованный запрос),
+заявки пользователя, сообщения обращения. Одно соединение, последовательные вызовы,
+печатаются mean/p50/p95 в микросекундах. Нужны данные в базе (scripts/seed_users.py).
+
+    python -m scripts.bench_queries
+    BENCH_QUERIES_N=5000 python -m scripts.bench_queries
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.core.database import SQLALCHEMY_DATABASE_URL, engine_options
+from app.models.users import User
+from app.services.support import SupportService
+from app.services.tickets import TicketService
+
+N = int(os.getenv("BENCH_QUERIES_N", "2000"))
+
+CONFIGS = [
+    ("no prepare, no cache", {"prepare_threshold": None, "compiled_cache_size": 0}),
+    ("no prepare", {"prepare_threshold": None}),
+    (f"prepared (threshold={settings.DB_PREPARE_THRESHOLD or 2})",
+     {"prepare_threshold": settings.DB_PREPARE_THRESHOLD or 2}),
+]
+
+
+async def sample_ids(db: AsyncSession):
+    row = (await db.execute(text(
+        """
+        SELECT t.user_id,
+               (SELECT st.id FROM support_tickets st
+                JOIN support_messages sm ON sm.ticket_id = st.id LIMIT 1)
+        FROM tickets t LIMIT 1
+        """
+    ))).one_or_none()
+    if row is None or row[1] is None:
+        raise SystemExit("нет данных: засейте заявки и обращения (scripts/seed_users.py)")
+    return row
+
+
+def queries(db: AsyncSession, user_id, support_ticket_id):
+    return {
+        "user by id": lambda: db.get(User, user_id, populate_existing=True),
+        "tickets by user": lambda: TicketService(db).get_user_ticket_rows(user_id),
+        "messages by ticket": lambda: SupportService(db).list_message_rows(support_ticket_id),
+    }
+
+
+async def bench(label: str, options: dict) -> dict[str, float]:
+    engine = create_async_engine(SQLALCHEMY_DATABASE_URL, **engine_options(pool_mode="session", **options))
+    results = {}
+    try:
+        async with AsyncSession(engine) as db:
+            user_id, support_ticket_id = await sample_ids(db)
+            for name, call in queries(db, user_id, support_ticket_id).items():
+                for _ in range(20):  # прогрев: соединение, кэши, порог prepare
+                    await call()
+                timings = []
+                for _ in range(N):
+                    started = time.perf_counter()
+                    await call()
+                    timings.append((time.perf_counter() - started) * 1e6)
+                timings.sort()
+                results[name] = statistics.fmean(timings)
+                print(
+                    f"{label:<28}{name:<22}{results[name]:>9.0f}{timings[len(timings) // 2]:>9.0f}"
+                    f"{timings[int(len(timings) * 0.95)]:>9.0f}"
+                )
+    finally:
+        await engine.dispose()
+    return results
+
+
+async def main() -> None:
+    print(f"runs={N}  (µs per call)")
+    print(f"{'config':<28}{'query':<22}{'mean':>9}{'p50':>9}{'p95':>9}")
+    runs = [await bench(label, options) for label, options in CONFIGS]
+    print()
+    for name in runs[0]:
+        print(f"{name:<22} prepared vs baseline: x{runs[0][name] / runs[-1][name]:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,220 @@
+"""
+Минимальный stand-in PgBouncer в режиме pool_mode=transaction — для тестов и локальной проверки.
+
+Клиенты подключаются к нему по TCP без пароля; он держит `size` собственных соединений
+с Postgres и выдаёт клиенту серверное соединение только на время транзакции: как только
+сервер присылает ReadyForQuery со статусом idle, соединение возвращается в общий пул и
+следующий запрос того же клиента может уйти в другой backend. Поэтому всё, что живёт
+дольше транзакции (prepared statements, SET, session advisory locks, temp-таблицы), ломается
+здесь так же, как за настоящим PgBouncer.
+
+Поддерживается только то, что нужно тестам: trust / cleartext / md5 к backend'у (не SCRAM),
+без SSL, без COPY-специфики и отмены запросов.
+
+    python -m scripts.pgbouncer_standin --port 6432 --size 4
+    DATABASE_URL=postgresql+psycopg://privet@127.0.0.1:6432/privetdb DB_POOL_MODE=transaction uvicorn app.main:app
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import os
+import struct
+
+from sqlalchemy.engine import make_url
+
+PROTOCOL_V3 = 196608
+SSL_REQUEST = 80877103
+GSSENC_REQUEST = 80877104
+CANCEL_REQUEST = 80877102
+
+
+async def _read_message(reader: asyncio.StreamReader) -> bytes:
+    head = await reader.readexactly(5)
+    (length,) = struct.unpack("!i", head[1:])
+    return head + await reader.readexactly(length - 4)
+
+
+def _message(kind: bytes, body: bytes = b"") -> bytes:
+    return kind + struct.pack("!i", len(body) + 4) + body
+
+
+class _Server:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.parameters: dict[bytes, bytes] = {}
+
+
+class TransactionPooler:
+    """Transaction-level multiplexing of client connections onto `size` backend connections."""
+
+    def __init__(self, database_url: str, size: int = 2) -> None:
+        url = make_url(database_url)
+        self.user = url.username or os.getenv("PGUSER", "postgres")
+        self.password = url.password or ""
+        self.database = url.database or self.user
+        self.host = url.query.get("host") or url.host or "localhost"
+        self.port = url.port or 5432
+        self.size = size
+        self.idle: asyncio.Queue[_Server] = asyncio.Queue()
+        self.parameters: dict[bytes, bytes] = {}
+        self.server: asyncio.AbstractServer | None = None
+        self.clients: set[asyncio.Task] = set()
+        self.closing = False
+        self.transactions = 0  # сколько раз backend выдавался клиенту
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        for _ in range(self.size):
+            self.idle.put_nowait(await self._connect())
+        self.server = await asyncio.start_server(self._serve_client, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        self.closing = True
+        if self.server is not None:
+            self.server.close()
+        for task in list(self.clients):
+            task.cancel()
+        await asyncio.gather(*self.clients, return_exceptions=True)
+        while not self.idle.empty():
+            backend = self.idle.get_nowait()
+            backend.writer.close()
+
+    async def _connect(self) -> _Server:
+        if self.host.startswith("/"):
+            reader, writer = await asyncio.open_unix_connection(f"{self.host}/.s.PGSQL.{self.port}")
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        params = b"user\0" + self.user.encode() + b"\0database\0" + self.database.encode() + b"\0\0"
+        body = struct.pack("!i", PROTOCOL_V3) + params
+        writer.write(struct.pack("!i", len(body) + 4) + body)
+        backend = _Server(reader, writer)
+        while True:
+            msg = await _read_message(reader)
+            kind, body = msg[:1], msg[5:]
+            if kind == b"R":
+                (code,) = struct.unpack("!i", body[:4])
+                if code == 3:
+                    writer.write(_message(b"p", self.password.encode() + b"\0"))
+                elif code == 5:
+                    inner = hashlib.md5((self.password + self.user).encode()).hexdigest()
+                    outer = hashlib.md5(inner.encode() + body[4:8]).hexdigest()
+                    writer.write(_message(b"p", b"md5" + outer.encode() + b"\0"))
+                elif code != 0:
+                    raise RuntimeError(f"unsupported backend auth method {code} (use trust or md5)")
+            elif kind == b"S":
+                name, value, _ = body.split(b"\0", 2)
+                backend.parameters[name] = value
+            elif kind == b"E":
+                raise RuntimeError(f"backend refused connection: {body!r}")
+            elif kind == b"Z":
+                break
+        self.parameters = self.parameters or backend.parameters
+        return backend
+
+    async def _handshake(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        while True:
+            (length,) = struct.unpack("!i", await reader.readexactly(4))
+            body = await reader.readexactly(length - 4)
+            (code,) = struct.unpack("!i", body[:4])
+            if code in (SSL_REQUEST, GSSENC_REQUEST):
+                writer.write(b"N")
+                continue
+            if code != PROTOCOL_V3:  # CancelRequest и прочее не поддерживаем
+                return False
+            break
+        out = [_message(b"R", struct.pack("!i", 0))]
+        out += [_message(b"S", name + b"\0" + value + b"\0") for name, value in self.parameters.items()]
+        out.append(_message(b"K", struct.pack("!ii", os.getpid(), 0)))
+        out.append(_message(b"Z", b"I"))
+        writer.write(b"".join(out))
+        await writer.drain()
+        return True
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self.clients.add(task)
+        incoming: asyncio.Queue[bytes | None] = asyncio.Queue()
+
+        async def pump_client() -> None:
+            try:
+                while True:
+                    await incoming.put(await _read_message(reader))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                await incoming.put(None)
+
+        pump: asyncio.Task | None = None
+        client_next: asyncio.Future | None = None
+        try:
+            if not await self._handshake(reader, writer):
+                return
+            pump = asyncio.create_task(pump_client())
+            client_next = asyncio.ensure_future(incoming.get())
+            while True:
+                first = await client_next
+                if first is None or first[:1] == b"X":
+                    return
+                backend = await self.idle.get()
+                self.transactions += 1
+                backend.writer.write(first)
+                client_next = asyncio.ensure_future(incoming.get())
+                server_next = asyncio.ensure_future(_read_message(backend.reader))
+                released = False
+                try:
+                    while not released:
+                        done, _ = await asyncio.wait({client_next, server_next}, return_when=asyncio.FIRST_COMPLETED)
+                        if server_next in done:
+                            msg = server_next.result()
+                            writer.write(msg)
+                            if msg[:1] == b"Z" and msg[5:6] == b"I":
+                                # транзакция закончилась — backend свободен для любого клиента
+                                await writer.drain()
+                                released = True
+                                break
+                            server_next = asyncio.ensure_future(_read_message(backend.reader))
+                        if client_next in done:
+                            msg = client_next.result()
+                            if msg is None or msg[:1] == b"X":
+                                return
+                            backend.writer.write(msg)
+                            client_next = asyncio.ensure_future(incoming.get())
+                finally:
+                    if released:
+                        self.idle.put_nowait(backend)
+                    else:
+                        # клиент ушёл посреди транзакции: соединение в неизвестном состоянии
+                        server_next.cancel()
+                        backend.writer.close()
+                        if not self.closing:
+                            self.idle.put_nowait(await self._connect())
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for pending in (pump, client_next):
+                if pending is not None:
+                    pending.cancel()
+            writer.close()
+            self.clients.discard(task)
+
+
+async def _main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "postgresql://privet@localhost/privetdb"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6432)
+    parser.add_argument("--size", type=int, default=2, help="backend connections")
+    args = parser.parse_args()
+    pooler = TransactionPooler(args.database_url, args.size)
+    port = await pooler.start(args.host, args.port)
+    print(f"transaction pooler on {args.host}:{port} -> {pooler.host}:{pooler.port}/{pooler.database} x{args.size}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await pooler.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
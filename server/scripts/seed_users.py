@@ -1,7 +1,18 @@
 import asyncio
+import os
 import random
-
-from app.core.database import async_session_maker
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import select, text
+
+from app.core.database import get_sessionmaker
+from app.core.security import hash_password
+from app.models.devices import Device
+from app.models.faq import FAQArticle, FAQCategory
+from app.models.tickets import Ticket, TicketStatus
+from app.models.users import User
 from app.services.users import UserService
 
 
@@ -21,10 +32,23 @@ DOMAINS = ["gmail.ru", "mail.ru", "yandex.ru"]
 PREFIXES = ["985", "977", "903"]
 
 
-COUNT = int(__import__("os").getenv("SEED_COUNT", "473"))
-START_OFFSET = int(__import__("os").getenv("SEED_OFFSET", "0"))
+COUNT = int(os.getenv("SEED_COUNT", "473"))
+START_OFFSET = int(os.getenv("SEED_OFFSET", "0"))
 PASSWORD = "12345678"
 
+# service — через UserService.create (как при регистрации); bulk — COPY пачками, для 100k+ пользователей.
+MODE = os.getenv("SEED_MODE", "service")
+CHUNK = int(os.getenv("SEED_CHUNK", "20000"))
+
+# Фикстуры для нагрузочных сценариев (server/loadtest.py). По умолчанию выключены.
+DEVICES_PER_USER = int(os.getenv("SEED_DEVICES_PER_USER", "0"))
+TICKETS_PER_USER = int(os.getenv("SEED_TICKETS_PER_USER", "0"))
+FAQ_ARTICLES = int(os.getenv("SEED_FAQ_ARTICLES", "0"))
+
+BRANDS = ["Samsung", "LG", "Bosch", "Philips", "Sony", "Haier"]
+DEVICE_TITLES = ["Телевизор", "Холодильник", "Стиральная машина", "Пылесос", "Микроволновка"]
+FAQ_TOPICS = ["оплата", "подписка", "заявка", "мастер", "устройство", "договор"]
+
 
 def make_phone(i: int) -> str:
     prefix = PREFIXES[i % len(PREFIXES)]
@@ -49,29 +73,152 @@ def make_address(i: int) -> str:
     return f"г. Москва, ул. {street}, д. {house}, кв. {apt}"
 
 
-async def main() -> None:
-    async with async_session_maker() as session:
-        service = UserService(session)
-        created = 0
-        for idx in range(COUNT):
+def make_serial(i: int, k: int) -> str:
+    return f"SN-{i:07d}-{k:02d}"
+
+
+async def seed_fixtures(session, user: User, i: int) -> None:
+    """Devices and tickets for one seeded user (used by load-test scenarios)."""
+    for k in range(DEVICES_PER_USER):
+        session.add(
+            Device(
+                user_id=user.id,
+                title=DEVICE_TITLES[(i + k) % len(DEVICE_TITLES)],
+                brand=BRANDS[(i + k) % len(BRANDS)],
+                model=f"M-{(i * 7 + k) % 1000:03d}",
+                serial_number=make_serial(i, k),
+            )
+        )
+    for k in range(TICKETS_PER_USER):
+        session.add(
+            Ticket(
+                user_id=user.id,
+                title=f"Заявка {k + 1}: {DEVICE_TITLES[(i + k) % len(DEVICE_TITLES)]}",
+                description="Сгенерировано seed_users.py",
+                status=TicketStatus.ACCEPTED,
+            )
+        )
+    await session.commit()
+
+
+async def seed_faq(session) -> None:
+    slug = "bench"
+    category = await session.scalar(select(FAQCategory).where(FAQCategory.slug == slug))
+    if category is None:
+        category = FAQCategory(slug=slug, title="Частые вопросы")
+        session.add(category)
+        await session.flush()
+    for k in range(FAQ_ARTICLES):
+        topic = FAQ_TOPICS[k % len(FAQ_TOPICS)]
+        session.add(
+            FAQArticle(
+                category_id=category.id,
+                title=f"Вопрос #{k + 1} про {topic}",
+                content=f"Подробный ответ про {topic}. " * 20,
+                keywords=[topic, f"faq{k % 50}"],
+            )
+        )
+    await session.commit()
+    print(f"faq: {FAQ_ARTICLES} articles in '{slug}'")
+
+
+USER_COLUMNS = (
+    "id", "phone", "email", "password_hash", "name", "address",
+    "status", "has_subscription", "created_at", "updated_at",
+)
+
+
+async def copy_users_chunk(session, rows: list[tuple]) -> int:
+    """COPY a chunk into a temp table, then move it into users/manager_clients in one statement.
+
+    Existing phones/emails are skipped (ON CONFLICT DO NOTHING) instead of aborting the whole COPY.
+    """
+    conn = await session.connection()
+    raw = (await conn.get_raw_connection()).driver_connection
+    await session.execute(text(
+        # живёт одну транзакцию: за PgBouncer (transaction mode) следующая пачка может попасть в другой backend
+        "CREATE TEMP TABLE seed_users (LIKE users INCLUDING DEFAULTS) ON COMMIT DROP"
+    ))
+    columns = ", ".join(USER_COLUMNS)
+    async with raw.cursor() as cur:
+        async with cur.copy(f"COPY seed_users ({columns}) FROM STDIN") as copy:
+            for row in rows:
+                await copy.write_row(row)
+    inserted = await session.scalar(text(f"""
+        WITH new_users AS (
+            INSERT INTO users ({columns})
+            SELECT {columns} FROM seed_users
+            ON CONFLICT DO NOTHING
+            RETURNING id
+        ), new_clients AS (
+            INSERT INTO manager_clients (id, user_id, status)
+            SELECT gen_random_uuid(), id, 'new' FROM new_users
+            ON CONFLICT (user_id) DO NOTHING
+        )
+        SELECT count(*) FROM new_users
+    """))
+    await session.commit()
+    return int(inserted or 0)
+
+
+async def seed_bulk(session) -> int:
+    # Пароль у всех один — хэшируем один раз, а не COUNT раз.
+    password_hash = hash_password(PASSWORD)
+    now = datetime.now(timezone.utc)
+    created = 0
+    started = time.perf_counter()
+    for chunk_start in range(0, COUNT, CHUNK):
+        rows = []
+        for idx in range(chunk_start, min(chunk_start + CHUNK, COUNT)):
             i = START_OFFSET + idx
             name = make_name(i)
-            phone = make_phone(i)
-            email = make_email(i, name)
-            address = make_address(i)
-            try:
-                await service.create(
-                    phone=phone,
-                    password=PASSWORD,
-                    name=name,
-                    email=email,
-                    address=address,
-                )
-                created += 1
-            except Exception as exc:
-                print(f"skip {phone} {email}: {exc}")
-            if (idx + 1) % 50 == 0:
-                print(f"progress: {idx + 1}/{COUNT}")
+            rows.append((
+                uuid.uuid4(), make_phone(i), make_email(i, name), password_hash, name, make_address(i),
+                "active", False, now, now,
+            ))
+        created += await copy_users_chunk(session, rows)
+        print(f"progress: {chunk_start + len(rows)}/{COUNT} ({time.perf_counter() - started:.1f}s)")
+    return created
+
+
+async def seed_with_service(session) -> int:
+    service = UserService(session)
+    created = 0
+    for idx in range(COUNT):
+        i = START_OFFSET + idx
+        name = make_name(i)
+        phone = make_phone(i)
+        email = make_email(i, name)
+        address = make_address(i)
+        try:
+            user = await service.create(
+                phone=phone,
+                password=PASSWORD,
+                name=name,
+                email=email,
+                address=address,
+            )
+            created += 1
+            if DEVICES_PER_USER or TICKETS_PER_USER:
+                await seed_fixtures(session, user, i)
+        except Exception as exc:
+            await session.rollback()
+            print(f"skip {phone} {email}: {exc}")
+        if (idx + 1) % 50 == 0:
+            print(f"progress: {idx + 1}/{COUNT}")
+    return created
+
+
+async def main() -> None:
+    async with get_sessionmaker()() as session:
+        if MODE == "bulk":
+            if DEVICES_PER_USER or TICKETS_PER_USER:
+                print("bulk mode seeds users only; run SEED_MODE=service for devices/tickets fixtures")
+            created = await seed_bulk(session)
+        else:
+            created = await seed_with_service(session)
+        if FAQ_ARTICLES:
+            await seed_faq(session)
         print(f"done: {created}/{COUNT}")
 
 
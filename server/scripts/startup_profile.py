@@ -0,0 +1,147 @@
+"""
+Холодный старт API: профиль `python -X importtime -c "import app.main"` и время до первого ответа uvicorn.
+
+Импорт меряется в отдельных процессах (RUNS раз, берётся самый быстрый прогон — остальное
+шум диска/CPU). Сводка — собственное время импорта по пакетам верхнего уровня и самые
+дорогие модули. Отдельно проверяется, что тяжёлые зависимости «по требованию» (boto3,
+httpx, smtplib) на старте не загружаются.
+
+`--serve` дополнительно поднимает `uvicorn app.main:app` на свободном порту и меряет время
+от запуска процесса до первого 200 на /api/v1/ping/ (lifespan, без запросов к БД).
+
+    python -m scripts.startup_profile
+    python -m scripts.startup_profile --serve
+    STARTUP_IMPORT_BUDGET_MS=2500 STARTUP_BUDGET_MS=4000 python -m scripts.startup_profile --serve  # exit 2 при превышении
+
+Снимок с описанием цели — docs/STARTUP.md.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+RUNS = int(os.getenv("STARTUP_RUNS", "3"))
+
+# загружаются при первом использовании (app/services/storage.py, app/core/http.py, app/core/mailer.py)
+DEFERRED_MODULES = ("boto3", "botocore", "httpx", "httpcore", "smtplib")
+
+PROBE = (
+    "import json, sys; import app.main; "
+    f"print(json.dumps(sorted(m for m in {DEFERRED_MODULES!r} if m in sys.modules)))"
+)
+
+
+def _env() -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SERVER_DIR), env.get("PYTHONPATH")]))
+    env.pop("PYTHONIMPORTTIME", None)
+    return env
+
+
+def profile_import() -> dict:
+    """One `-X importtime` run: cumulative app.main, self time per module, deferred modules seen."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=SERVER_DIR, env=_env(), capture_output=True, text=True, check=True,
+    )
+    modules: dict[str, int] = {}
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        name = name.strip()
+        modules[name] = modules.get(name, 0) + int(self_us)
+        if name == "app.main":
+            total_us = int(cumulative_us)
+    return {"total_ms": total_us / 1000, "modules": modules, "loaded": json.loads(proc.stdout.strip().splitlines()[-1])}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_response(timeout: float = 30.0) -> float:
+    """Spawn `uvicorn app.main:app`, return ms until /api/v1/ping/ answers 200."""
+    port = _free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=SERVER_DIR, env=_env(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {proc.returncode}: {proc.stderr.read().decode()[-500:]}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/v1/ping/", timeout=1) as resp:
+                    if resp.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.02)
+        raise RuntimeError(f"uvicorn did not answer within {timeout:.0f}s")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def by_package(modules: dict[str, int]) -> list[tuple[str, float]]:
+    packages: dict[str, int] = defaultdict(int)
+    for name, self_us in modules.items():
+        top = name.split(".")[0]
+        packages["app." + name.split(".")[1] if top == "app" and "." in name else top] += self_us
+    return sorted(((name, us / 1000) for name, us in packages.items()), key=lambda item: -item[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--serve", action="store_true", help="also measure uvicorn time to first response")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [profile_import() for _ in range(RUNS)]
+    best = min(runs, key=lambda run: run["total_ms"])
+    print(f"import app.main: best {best['total_ms']:.0f} ms, runs "
+          + " ".join(f"{run['total_ms']:.0f}" for run in runs) + f" ms, {len(best['modules'])} modules")
+
+    print(f"\n{'package':<28}{'self ms':>9}")
+    for name, ms in by_package(best["modules"])[:args.top]:
+        print(f"{name:<28}{ms:>9.1f}")
+    print(f"\n{'module':<44}{'self ms':>9}")
+    for name, us in sorted(best["modules"].items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<44}{us / 1000:>9.1f}")
+
+    failures = []
+    if best["loaded"]:
+        failures.append(f"deferred modules imported at startup: {', '.join(best['loaded'])}")
+    import_budget = os.getenv("STARTUP_IMPORT_BUDGET_MS")
+    if import_budget and best["total_ms"] > float(import_budget):
+        failures.append(f"import app.main {best['total_ms']:.0f} ms > {import_budget} ms")
+
+    if args.serve:
+        first_response = min(time_to_first_response() for _ in range(RUNS))
+        print(f"\nuvicorn app.main:app -> first 200: {first_response:.0f} ms (best of {RUNS})")
+        budget = os.getenv("STARTUP_BUDGET_MS")
+        if budget and first_response > float(budget):
+            failures.append(f"cold start {first_response:.0f} ms > {budget} ms")
+
+    if failures:
+        print("\n" + "\n".join(failures))
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Вебхук YooKassa по счетам (POST /payments/yookassa/notify, kind=invoice).
+
+Сумма платежа сверяется с суммой всех счетов пачки — оплаченных и нет; оплачиваются только
+неоплаченные, так что повторная доставка полностью или частично применённого платежа отвечает
+ok и не создаёт второй оплаты. Несуществующие/чужие счета и неверная сумма — 400.
+
+Запросы идут через ASGI-приложение (httpx.ASGITransport) на локальный Postgres внутри внешней
+транзакции (commit -> RELEASE SAVEPOINT), которая в конце откатывается.
+
+    python -m pytest -q test_payments_webhook.py
+
+База — PLAN_DATABASE_URL или DATABASE_URL; если она недоступна, тест пропускается.
+"""
+
+import os
+import uuid
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.database import SQLALCHEMY_DATABASE_URL, get_db
+from app.main import app
+
+DATABASE_URL = os.getenv("PLAN_DATABASE_URL", SQLALCHEMY_DATABASE_URL)
+NOTIFY = "/payments/yookassa/notify"
+
+
+def _notify(user_id: uuid.UUID, invoice_ids: list[uuid.UUID], value: str) -> dict:
+    return {
+        "event": "payment.succeeded",
+        "object": {
+            "status": "succeeded",
+            "amount": {"value": value, "currency": "RUB"},
+            "metadata": {"kind": "invoice", "user_id": str(user_id), "invoice_ids": ",".join(map(str, invoice_ids))},
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_invoice_webhook_is_idempotent_and_strict(monkeypatch):
+    engine = create_async_engine(DATABASE_URL, poolclass=NullPool)
+    try:
+        conn = await engine.connect()
+    except Exception as exc:  # нет локального Postgres — нечего проверять
+        await engine.dispose()
+        pytest.skip(f"database unavailable: {exc}")
+
+    async def session_in_test_transaction():
+        async with AsyncSession(
+            bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint"
+        ) as session:
+            yield session
+
+    async def payments_of(invoice_id: uuid.UUID) -> int:
+        return await conn.scalar(
+            text("SELECT count(*) FROM user_invoice_payments WHERE invoice_id = :id"), {"id": invoice_id}
+        )
+
+    monkeypatch.setattr(settings, "YOOKASSA_WEBHOOK_SECRET", None)
+    trans = await conn.begin()
+    app.dependency_overrides[get_db] = session_in_test_transaction
+    try:
+        client_id, other_id = uuid.uuid4(), uuid.uuid4()
+        for user_id in (client_id, other_id):
+            await conn.execute(
+                text(
+                    "INSERT INTO users (id, phone, password_hash, name, created_at, updated_at, has_subscription) "
+                    "VALUES (:id, :phone, 'x', 'Webhook', now(), now(), false)"
+                ),
+                {"id": user_id, "phone": f"7{user_id.int % 10**9:09d}"},
+            )
+        first, second = uuid.uuid4(), uuid.uuid4()
+        for invoice_id, amount in ((first, "100.00"), (second, "250.50")):
+            await conn.execute(
+                text(
+                    "INSERT INTO user_invoices (id, client_id, amount, description, contract_number, due_date) "
+                    "VALUES (:id, :client, :amount, 'Webhook', 'W-1', current_date + 5)"
+                ),
+                {"id": invoice_id, "client": client_id, "amount": amount},
+            )
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+            async def notify(user_id, invoice_ids, value):
+                return await client.post(NOTIFY, json=_notify(user_id, invoice_ids, value))
+
+            # чужие и несуществующие счета, неверная сумма — 400, ничего не оплачено
+            assert (await notify(client_id, [uuid.uuid4()], "100.00")).status_code == 400
+            assert (await notify(other_id, [first], "100.00")).status_code == 400
+            assert (await notify(client_id, [first, second], "100.00")).status_code == 400
+            assert await payments_of(first) == 0
+
+            # первый счёт оплачен отдельно, затем приходит платёж за всю пачку
+            assert (await notify(client_id, [first], "100.00")).status_code == 200
+            resp = await notify(client_id, [first, second], "350.50")
+            assert resp.status_code == 200, resp.text
+            assert (await payments_of(first), await payments_of(second)) == (1, 1)
+
+            # повторная доставка того же платежа — ok, без второй оплаты
+            assert (await notify(client_id, [first, second], "350.50")).status_code == 200
+            assert (await payments_of(first), await payments_of(second)) == (1, 1)
+            # уже оплаченный счёт вместе с неизвестным — всё ещё 400
+            assert (await notify(client_id, [first, uuid.uuid4()], "100.00")).status_code == 400
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        await trans.rollback()
+        await conn.close()
+        await engine.dispose()
@@ -0,0 +1,126 @@
+"""
+Сколько SQL-запросов делают пишущие эндпоинты.
+
+Запросы идут через ASGI-приложение (httpx.ASGITransport) на локальный Postgres; сессия
+запроса привязана к внешней транзакции (commit -> RELEASE SAVEPOINT), которая в конце
+откатывается. Считаются выполненные драйвером statement'ы, кроме служебных SAVEPOINT.
+Бюджет ловит возврат refresh()/перечитывания после записи: ответ строится из
+INSERT/UPDATE ... RETURNING.
+
+    python -m pytest -q test_query_counts.py
+
+База — PLAN_DATABASE_URL или DATABASE_URL; если она недоступна, тест пропускается.
+"""
+
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import httpx
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.database import SQLALCHEMY_DATABASE_URL, get_db
+from app.core.security import create_access_token
+from app.main import app
+
+DATABASE_URL = os.getenv("PLAN_DATABASE_URL", SQLALCHEMY_DATABASE_URL)
+
+SERVICE_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+@dataclass
+class Case:
+    name: str
+    method: str
+    url: Callable[[dict], str]
+    body: Callable[[dict], Any]
+    max_statements: int
+    save: str | None = None  # положить `id` из ответа в state под этим ключом
+
+
+CASES = [
+    # авторизация (get User) + INSERT tickets + INSERT ticket_status_history
+    Case("POST /tickets", "POST", lambda s: "/tickets/", lambda s: {"title": "Counted"}, 3, save="ticket"),
+    # + get_by_id с selectinload вложений + UPDATE ... RETURNING updated_at
+    Case("PATCH /tickets/{id}", "PATCH", lambda s: f"/tickets/{s['ticket']}", lambda s: {"title": "Renamed"}, 4),
+    Case("PATCH /tickets/{id}/status", "PATCH", lambda s: f"/tickets/{s['ticket']}/status",
+         lambda s: {"status": "in_progress"}, 5),
+    Case("POST /tickets/{id}/messages", "POST", lambda s: f"/tickets/{s['ticket']}/messages",
+         lambda s: {"body": "hello"}, 4),
+    Case("POST /support", "POST", lambda s: "/support/", lambda s: {"subject": "Counted"}, 2, save="support"),
+    Case("POST /support/{id}/messages/user", "POST", lambda s: f"/support/{s['support']}/messages/user",
+         lambda s: {"body": "hello"}, 3),
+    Case("POST /devices", "POST", lambda s: "/devices",
+         lambda s: {"user_id": s["user"], "title": "Counted", "brand": "B", "model": "M",
+                    "serial_number": f"COUNT-{s['user']}"}, 1),
+    # CTE регистрации + сессия (чистка протухших + INSERT)
+    Case("POST /auth/register", "POST", lambda s: "/auth/register",
+         lambda s: {"phone": s["phone"], "password": "12345678", "name": "Counted",
+                    "email": f"count-{s['phone']}@example.com"}, 3),
+]
+
+
+@pytest.mark.asyncio
+async def test_write_endpoint_query_counts():
+    engine = create_async_engine(DATABASE_URL, poolclass=NullPool)
+    try:
+        conn = await engine.connect()
+    except Exception as exc:  # нет локального Postgres — нечего проверять
+        await engine.dispose()
+        pytest.skip(f"database unavailable: {exc}")
+
+    statements: list[str] = []
+
+    def count(_conn, _cursor, statement, _parameters, _context, _executemany):
+        if not statement.lstrip().upper().startswith(SERVICE_STATEMENTS):
+            statements.append(statement)
+
+    async def session_in_test_transaction():
+        async with AsyncSession(
+            bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint"
+        ) as session:
+            yield session
+
+    errors = []
+    trans = await conn.begin()
+    app.dependency_overrides[get_db] = session_in_test_transaction
+    try:
+        user_id = uuid.uuid4()
+        await conn.execute(
+            text(
+                "INSERT INTO users (id, phone, password_hash, name, created_at, updated_at, has_subscription) "
+                "VALUES (:id, :phone, 'x', 'Counted', now(), now(), false)"
+            ),
+            {"id": user_id, "phone": f"count-{user_id.hex[:12]}"},
+        )
+        state = {"user": str(user_id), "phone": "5" + str(time.time_ns())[-9:]}
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1", headers=headers) as client:
+            for case in CASES:
+                statements.clear()
+                event.listen(conn.sync_connection, "before_cursor_execute", count)
+                try:
+                    resp = await client.request(case.method, case.url(state), json=case.body(state))
+                finally:
+                    event.remove(conn.sync_connection, "before_cursor_execute", count)
+                if resp.status_code >= 400:
+                    errors.append(f"{case.name}: HTTP {resp.status_code} {resp.text[:200]}")
+                    continue
+                if case.save:
+                    state[case.save] = resp.json()["id"]
+                if len(statements) > case.max_statements:
+                    listing = "\n    ".join(" ".join(s.split())[:160] for s in statements)
+                    errors.append(f"{case.name}: {len(statements)} statements > {case.max_statements}\n    {listing}")
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        await trans.rollback()
+        await conn.close()
+        await engine.dispose()
+
+    assert not errors, "Лишние запросы:\n" + "\n".join(errors)
@@ -0,0 +1,227 @@
+"""
+Регрессия планов для горячих запросов сервисов.
+
+Сидирует объём (PLAN_SCALE пользователей с тикетами, устройствами, счетами и
+обращениями) в локальный Postgres внутри транзакции, вызывает методы сервисов,
+перехватывает их SQL и прогоняет каждый через EXPLAIN (ANALYZE, BUFFERS).
+Падает, если план ушёл в Seq Scan по большой таблице или вышел за бюджет
+строк/буферов. В конце транзакция откатывается — в базе ничего не остаётся.
+
+    PLAN_SCALE=5000 python -m pytest -q test_query_plans.py
+
+База — PLAN_DATABASE_URL или DATABASE_URL; если она недоступна, тест пропускается.
+"""
+
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.database import SQLALCHEMY_DATABASE_URL
+from app.services.devices import DeviceService
+from app.services.invoices import InvoiceService
+from app.services.support import SupportService
+from app.services.tickets import TicketService
+
+DATABASE_URL = os.getenv("PLAN_DATABASE_URL", SQLALCHEMY_DATABASE_URL)
+SCALE = int(os.getenv("PLAN_SCALE", "2000"))
+
+# Seq Scan, прочитавший хотя бы столько строк, считаем регрессией: маленькие
+# справочники и пустые таблицы Postgres законно читает целиком.
+SEQ_SCAN_ROWS = 1000
+
+SEED_SQL = [
+    """
+    CREATE TEMP TABLE plan_users ON COMMIT DROP AS
+    SELECT g AS n, gen_random_uuid() AS id FROM generate_series(1, :scale) AS g
+    """,
+    """
+    INSERT INTO users (id, phone, password_hash, name, created_at, updated_at, has_subscription)
+    SELECT id, 'plan-' || n || '-' || left(id::text, 8), 'x', 'Plan ' || n, now(), now(), false
+    FROM plan_users
+    """,
+    # 4 устройства, 10 заявок (по 2 записи истории), 6 счетов, 3 обращения по 10 сообщений
+    """
+    INSERT INTO devices (id, user_id, title, brand, model, serial_number, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, 'Device', 'Brand', 'Model', 'PLAN-' || u.id || '-' || d, now(), now()
+    FROM plan_users AS u, generate_series(1, 4) AS d
+    """,
+    """
+    INSERT INTO tickets (id, user_id, title, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, 'Ticket ' || t, now() - make_interval(days => t), now()
+    FROM plan_users AS u, generate_series(1, 10) AS t
+    ORDER BY random()
+    """,
+    """
+    INSERT INTO ticket_status_history (id, ticket_id, to_status, changed_by, created_at, updated_at)
+    SELECT gen_random_uuid(), t.id, 'new', 'USER', t.created_at + make_interval(hours => h), now()
+    FROM tickets AS t JOIN plan_users AS u ON u.id = t.user_id, generate_series(1, 2) AS h
+    """,
+    """
+    INSERT INTO user_invoices (id, client_id, amount, description, contract_number, due_date, status, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, 1000 + i, 'Invoice', 'DA-PLAN', current_date + (i * 10), 'pending', now(), now()
+    FROM plan_users AS u, generate_series(1, 6) AS i
+    ORDER BY random()
+    """,
+    """
+    UPDATE user_invoices SET status = 'paid'
+    WHERE client_id IN (SELECT id FROM plan_users) AND amount > 1003
+    """,
+    """
+    INSERT INTO support_tickets (id, user_id, subject, status, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, 'Support ' || s, 'open', now() - make_interval(days => s), now()
+    FROM plan_users AS u, generate_series(1, 3) AS s
+    ORDER BY random()
+    """,
+    """
+    INSERT INTO support_messages (id, ticket_id, author, body, created_at, updated_at)
+    SELECT gen_random_uuid(), st.id, 'user', 'Message ' || m, st.created_at + make_interval(mins => m), now()
+    FROM support_tickets AS st JOIN plan_users AS u ON u.id = st.user_id, generate_series(1, 10) AS m
+    ORDER BY random()
+    """,
+]
+
+SEEDED_TABLES = (
+    "users", "devices", "tickets", "ticket_status_history",
+    "user_invoices", "support_tickets", "support_messages",
+)
+
+
+@dataclass
+class Sample:
+    user_id: uuid.UUID
+    ticket_id: uuid.UUID
+    device_id: uuid.UUID
+    support_ticket_id: uuid.UUID
+
+
+@dataclass
+class Case:
+    name: str
+    call: Callable[[AsyncSession, Sample], Awaitable]
+    max_rows: int  # строк, прочитанных всеми узлами сканирования
+    max_buffers: int  # shared buffers (hit + read) на запрос
+    index: str | None = None  # индекс, который план обязан использовать
+
+
+async def _second_invoice_page(db: AsyncSession, s: Sample):
+    svc = InvoiceService(db)
+    _, cursor = await svc.page_for_user(s.user_id, 2)
+    return await svc.page_for_user(s.user_id, 2, cursor=cursor)
+
+
+CASES = [
+    Case("tickets.user_rows", lambda db, s: TicketService(db).get_user_ticket_rows(s.user_id), 60, 40),
+    Case("tickets.user_latest", lambda db, s: TicketService(db).get_user_tickets(s.user_id, limit=5), 60, 40),
+    Case("tickets.by_id", lambda db, s: TicketService(db).get_by_id(s.ticket_id, s.user_id), 20, 20),
+    Case("tickets.history", lambda db, s: TicketService(db).get_history(s.ticket_id), 20, 20),
+    Case("devices.user", lambda db, s: DeviceService(db).get_user_devices(s.user_id), 30, 25),
+    Case("devices.by_id", lambda db, s: DeviceService(db).get_by_id(s.device_id, s.user_id), 20, 20),
+    Case("invoices.visible", lambda db, s: InvoiceService(db).list_for_user(s.user_id), 20, 20,
+         index="ix_user_invoices_unpaid"),
+    Case("invoices.page", _second_invoice_page, 20, 20, index="ix_user_invoices_unpaid"),
+    Case("invoices.unpaid_summary", lambda db, s: InvoiceService(db).unpaid_summary(s.user_id), 20, 20,
+         index="ix_user_invoices_unpaid"),
+    Case("support.user_list", lambda db, s: SupportService(db).list_tickets_for_user(s.user_id), 30, 25),
+    Case("support.counts", lambda db, s: SupportService(db).counts_for_user(s.user_id), 30, 25),
+    Case("support.messages", lambda db, s: SupportService(db).list_message_rows(s.support_ticket_id), 60, 40),
+]
+
+
+def _walk(node: dict):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _walk(child)
+
+
+def check_plan(plan: dict, case: Case) -> list[str]:
+    """Problems found in one EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) plan."""
+    problems = []
+    rows_read = 0
+    indexes = set()
+    for node in _walk(plan):
+        if "Scan" not in node["Node Type"]:
+            continue
+        indexes.add(node.get("Index Name"))
+        loops = node.get("Actual Loops", 1)
+        read = (node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)) * loops
+        rows_read += read
+        if node["Node Type"] == "Seq Scan" and read >= SEQ_SCAN_ROWS:
+            problems.append(f"Seq Scan on {node.get('Relation Name')} ({read} rows)")
+    if case.index and case.index not in indexes:
+        problems.append(f"{case.index} not used")
+    if rows_read > case.max_rows:
+        problems.append(f"scanned {rows_read} rows > budget {case.max_rows}")
+    buffers = plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+    if buffers > case.max_buffers:
+        problems.append(f"{buffers} buffers > budget {case.max_buffers}")
+    return problems
+
+
+async def _seed(conn) -> Sample:
+    for sql in SEED_SQL:
+        await conn.execute(text(sql), {"scale": SCALE})
+    for table in SEEDED_TABLES:
+        await conn.execute(text(f"ANALYZE {table}"))
+    row = (await conn.execute(text(
+        """
+        SELECT u.id,
+               (SELECT id FROM tickets WHERE user_id = u.id LIMIT 1),
+               (SELECT id FROM devices WHERE user_id = u.id LIMIT 1),
+               (SELECT id FROM support_tickets WHERE user_id = u.id LIMIT 1)
+        FROM plan_users AS u WHERE u.n = :n
+        """
+    ), {"n": SCALE // 2})).one()
+    return Sample(*row)
+
+
+@pytest.mark.asyncio
+async def test_service_query_plans():
+    engine = create_async_engine(DATABASE_URL, poolclass=NullPool)
+    try:
+        conn = await engine.connect()
+    except Exception as exc:  # нет локального Postgres — нечего проверять
+        await engine.dispose()
+        pytest.skip(f"database unavailable: {exc}")
+
+    captured: list[tuple[str, object]] = []
+
+    def capture(_conn, _cursor, statement, parameters, _context, _executemany):
+        if not statement.lstrip().upper().startswith("EXPLAIN"):
+            captured.append((statement, parameters))
+
+    errors = []
+    trans = await conn.begin()
+    try:
+        await conn.execute(text("SET LOCAL jit = off"))
+        sample = await _seed(conn)
+        db = AsyncSession(bind=conn)
+        for case in CASES:
+            captured.clear()
+            event.listen(conn.sync_connection, "before_cursor_execute", capture)
+            try:
+                await case.call(db, sample)
+            finally:
+                event.remove(conn.sync_connection, "before_cursor_execute", capture)
+            for statement, parameters in captured:
+                res = await conn.exec_driver_sql(
+                    "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters
+                )
+                raw = res.scalar_one()
+                plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+                problems = check_plan(plan, case)
+                if problems:
+                    errors.append(f"{case.name}: {'; '.join(problems)}\n    {' '.join(statement.split())}")
+        await db.close()
+    finally:
+        await trans.rollback()
+        await conn.close()
+        await engine.dispose()
+
+    assert not errors, "Регрессии планов:\n" + "\n".join(errors)
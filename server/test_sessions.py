@@ -0,0 +1,90 @@
+"""
+Refresh-токен не работает как Bearer access-токен.
+
+Проверяем на /api/v1/me: действующий refresh, refresh, уже заменённый ротацией, и refresh
+отозванной сессии, отзыв которой старше окна кэша отзывов (ACCESS_TOKEN_EXPIRE_MINUTES), —
+все получают 401; access-токен той же сессии — 200.
+
+Запросы идут через ASGI-приложение (httpx.ASGITransport) на локальный Postgres внутри внешней
+транзакции (commit -> RELEASE SAVEPOINT), которая в конце откатывается.
+
+    python -m pytest -q test_sessions.py
+
+База — PLAN_DATABASE_URL или DATABASE_URL; если она недоступна, тест пропускается.
+"""
+
+import os
+import time
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.database import SQLALCHEMY_DATABASE_URL, get_db
+from app.core.security import ACCESS_TOKEN_EXPIRE_MINUTES, decode_jwt_token
+from app.main import app
+from app.services.sessions import revocation_cache
+
+DATABASE_URL = os.getenv("PLAN_DATABASE_URL", SQLALCHEMY_DATABASE_URL)
+
+
+def _bearer(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_refresh_tokens_rejected_as_bearer():
+    engine = create_async_engine(DATABASE_URL, poolclass=NullPool)
+    try:
+        conn = await engine.connect()
+    except Exception as exc:  # нет локального Postgres — нечего проверять
+        await engine.dispose()
+        pytest.skip(f"database unavailable: {exc}")
+
+    async def session_in_test_transaction():
+        async with AsyncSession(
+            bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint"
+        ) as session:
+            yield session
+
+    trans = await conn.begin()
+    app.dependency_overrides[get_db] = session_in_test_transaction
+    revocation_cache.clear()
+    try:
+        phone = "6" + str(time.time_ns())[-9:]
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+            registered = await client.post(
+                "/auth/register",
+                json={"phone": phone, "password": "12345678", "name": "Sessions", "email": f"s-{phone}@example.com"},
+            )
+            assert registered.status_code == 201, registered.text
+            first = registered.json()
+            assert (await client.get("/me/", headers=_bearer(first["access_token"]))).status_code == 200
+
+            # действующий refresh
+            assert (await client.get("/me/", headers=_bearer(first["refresh_token"]))).status_code == 401
+
+            # refresh, заменённый ротацией: 401 и при этом без reuse-отзыва сессии
+            rotated = await client.post("/auth/refresh", json={"refresh_token": first["refresh_token"]})
+            assert rotated.status_code == 200, rotated.text
+            second = rotated.json()
+            assert (await client.get("/me/", headers=_bearer(first["refresh_token"]))).status_code == 401
+            assert (await client.get("/me/", headers=_bearer(second["access_token"]))).status_code == 200
+
+            # отзыв старше окна кэша: кэш его уже не помнит, refresh всё равно не пускает
+            assert (await client.post("/auth/logout", json={"refresh_token": second["refresh_token"]})).status_code == 204
+            await conn.execute(
+                text("UPDATE sessions SET revoked_at = now() - make_interval(mins => :minutes) WHERE id = :sid"),
+                {"minutes": ACCESS_TOKEN_EXPIRE_MINUTES + 5, "sid": decode_jwt_token(second["refresh_token"])["sid"]},
+            )
+            revocation_cache.clear()
+            assert (await client.get("/me/", headers=_bearer(second["refresh_token"]))).status_code == 401
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        revocation_cache.clear()
+        await trans.rollback()
+        await conn.close()
+        await engine.dispose()
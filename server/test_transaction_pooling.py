@@ -0,0 +1,117 @@
+"""
+API за PgBouncer в режиме pool_mode=transaction (DB_POOL_MODE=transaction).
+
+Вместо настоящего PgBouncer — scripts/pgbouncer_standin.py: два backend-соединения,
+выдаются клиенту на одну транзакцию. Проверяем, что stand-in действительно ломает
+состояние между транзакциями (prepared statement из прошлой транзакции не найден), а
+приложение с engine_options(pool_mode="transaction") под параллельной нагрузкой через него
+работает без ошибок.
+
+    python -m pytest -q test_transaction_pooling.py
+
+База — PLAN_DATABASE_URL или DATABASE_URL (trust/md5); если она недоступна, тест пропускается.
+"""
+
+import asyncio
+import os
+import uuid
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import SQLALCHEMY_DATABASE_URL, engine_options, get_db
+from app.core.security import create_access_token
+from app.main import app
+from scripts.pgbouncer_standin import TransactionPooler
+
+DATABASE_URL = os.getenv("PLAN_DATABASE_URL", SQLALCHEMY_DATABASE_URL)
+BACKENDS = 2
+CONCURRENCY = 24
+
+
+async def _start_pooler() -> tuple[TransactionPooler, str]:
+    pooler = TransactionPooler(DATABASE_URL, size=BACKENDS)
+    try:
+        port = await pooler.start()
+    except (OSError, RuntimeError) as exc:  # нет локального Postgres — нечего проверять
+        await pooler.close()
+        pytest.skip(f"database unavailable: {exc}")
+    url = make_url(DATABASE_URL)
+    dsn = f"postgresql+psycopg://{url.username}@127.0.0.1:{port}/{url.database}"
+    return pooler, dsn
+
+
+@pytest.mark.asyncio
+async def test_standin_drops_state_between_transactions():
+    pooler, dsn = await _start_pooler()
+    # session-режим с prepare сразу: второй раз psycopg шлёт Bind на имя, подготовленное
+    # в другом backend'е — так же, как за настоящим PgBouncer
+    engine = create_async_engine(dsn, **engine_options(prepare_threshold=0, pool_mode="session", pool_size=1))
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT 1 + :x"), {"x": 1})
+        with pytest.raises(DBAPIError, match="does not exist"):
+            async with engine.begin() as conn:
+                await conn.execute(text("SELECT 1 + :x"), {"x": 1})
+    finally:
+        await engine.dispose()
+        await pooler.close()
+
+
+@pytest.mark.asyncio
+async def test_api_behind_transaction_pooler():
+    pooler, dsn = await _start_pooler()
+    # prepare_threshold=0 намеренно: transaction-режим обязан его выключить
+    engine = create_async_engine(dsn, **engine_options(prepare_threshold=0, pool_mode="transaction", pool_size=0))
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def pooled_db():
+        async with sessions() as session:
+            yield session
+
+    user_id = uuid.uuid4()
+    app.dependency_overrides[get_db] = pooled_db
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "INSERT INTO users (id, phone, password_hash, name, created_at, updated_at, has_subscription) "
+                    "VALUES (:id, :phone, 'x', 'Pooled', now(), now(), false)"
+                ),
+                {"id": user_id, "phone": f"4{user_id.int % 10**9:09d}"},
+            )
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1", headers=headers) as client:
+            calls = []
+            for i in range(CONCURRENCY):
+                kind = i % 4
+                if kind == 0:
+                    calls.append(client.post("/tickets/", json={"title": f"Pooled {i}"}))
+                elif kind == 1:
+                    calls.append(client.get("/tickets/"))
+                elif kind == 2:
+                    calls.append(client.get("/me/bootstrap"))
+                else:
+                    calls.append(client.get("/support/meta"))
+            responses = await asyncio.gather(*calls)
+            failed = [(r.request.method, r.request.url.path, r.status_code, r.text[:200])
+                      for r in responses if r.status_code >= 400]
+            assert not failed, failed
+
+            # несколько транзакций подряд одного запроса (etag + список) — тоже через разные backend'ы
+            listed = await client.get("/tickets/")
+            assert listed.status_code == 200
+            assert len(listed.json()) == CONCURRENCY // 4
+        assert pooler.transactions > CONCURRENCY
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        async with engine.begin() as conn:
+            await conn.execute(text("DELETE FROM tickets WHERE user_id = :id"), {"id": user_id})
+            await conn.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+        await engine.dispose()
+        await pooler.close()